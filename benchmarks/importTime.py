@@ -0,0 +1,83 @@
+"""
+Measures how long importing the bot takes, each run in a fresh interpreter.
+
+Usage:
+    python benchmarks/importTime.py [--runs 10] [--module src.utils] [--compare REF]
+
+With `--compare`, the same measure is done on the given git reference (checked out in
+a temporary worktree) to see the difference.
+"""
+
+import statistics
+import subprocess
+import sys
+import tempfile
+from argparse import ArgumentParser
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+TIMER = (
+    "import time;"
+    "start = time.perf_counter();"
+    "import {module};"
+    "print(time.perf_counter() - start)"
+)
+
+
+def measureImport(root: Path, module: str, runs: int) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", TIMER.format(module=module)],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return timings
+
+
+def report(name: str, timings: list[float]) -> None:
+    print(
+        f"{name}: median {statistics.median(timings) * 1000:.1f} ms,"
+        f" min {min(timings) * 1000:.1f} ms,"
+        f" max {max(timings) * 1000:.1f} ms ({len(timings)} runs)"
+    )
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--module", default="src.utils")
+    parser.add_argument("--compare", default=None, help="git reference to compare with")
+    args = parser.parse_args()
+
+    current = measureImport(PROJECT_ROOT, args.module, args.runs)
+    report("current", current)
+
+    if args.compare:
+        with tempfile.TemporaryDirectory() as worktree:
+            subprocess.run(
+                ["git", "worktree", "add", "--detach", worktree, args.compare],
+                cwd=PROJECT_ROOT,
+                check=True,
+                capture_output=True,
+            )
+            try:
+                compared = measureImport(Path(worktree), args.module, args.runs)
+            finally:
+                subprocess.run(
+                    ["git", "worktree", "remove", "--force", worktree],
+                    cwd=PROJECT_ROOT,
+                    check=True,
+                )
+        report(args.compare, compared)
+        print(
+            f"speedup: x{statistics.median(compared) / statistics.median(current):.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
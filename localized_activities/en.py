@@ -37,3 +37,43 @@ ignore = {
     "Get 100 points with search bar",
     "Safeguard your family's info",
 }
+
+query_templates = [
+    "{food} recipe",
+    "how to cook {food}",
+    "{food} near me",
+    "weather in {city}",
+    "things to do in {city}",
+    "hotels in {city}",
+    "flights to {city}",
+    "{city} to {city} distance",
+    "{team} score",
+    "{team} schedule",
+    "best {product} {year}",
+    "{product} deals",
+    "{product} reviews",
+    "how to {hobby}",
+    "{hobby} for beginners",
+    "{topic} news",
+    "latest {topic} news",
+    "what is {topic}",
+    "{animal} facts",
+    "how long do {animal} live",
+    "{animal} {city} zoo",
+    "{food} restaurants in {city}",
+    "{product} store {city}",
+    "{team} vs {team}",
+    "{hobby} classes in {city}",
+    "{topic} trends {year}",
+    "{animal} vs {animal}",
+    "cheap flights {city} to {city}",
+]
+query_words = {
+    "food": ["lasagna", "banana bread", "chicken curry", "pancakes", "chili", "pad thai", "tacos", "risotto", "apple pie", "ramen", "meatloaf", "paella", "brownies", "guacamole", "pot roast"],
+    "city": ["new york", "paris", "tokyo", "london", "chicago", "rome", "sydney", "toronto", "berlin", "seattle", "miami", "madrid", "boston", "denver", "lisbon"],
+    "team": ["yankees", "lakers", "packers", "red sox", "warriors", "cowboys", "dodgers", "celtics", "eagles", "cubs", "knicks", "chiefs"],
+    "product": ["laptop", "headphones", "running shoes", "air fryer", "smartwatch", "tv", "coffee maker", "vacuum", "tablet", "camera", "office chair", "blender"],
+    "hobby": ["knit", "play guitar", "paint with watercolors", "start a garden", "bake bread", "learn chess", "meditate", "run a marathon", "draw portraits", "brew coffee"],
+    "topic": ["technology", "science", "space", "economy", "health", "climate", "movies", "music", "stock market", "ai"],
+    "animal": ["penguins", "elephants", "dolphins", "owls", "turtles", "koalas", "wolves", "octopus", "parrots", "tigers"],
+}
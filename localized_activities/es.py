@@ -37,3 +37,42 @@ ignore = {
     "Get 100 points with search bar",
     "Safeguard your family's info",
 }
+
+query_templates = [
+    "receta de {food}",
+    "cómo hacer {food}",
+    "{food} cerca de mí",
+    "tiempo en {city}",
+    "qué hacer en {city}",
+    "hoteles en {city}",
+    "vuelos a {city}",
+    "distancia {city} {city}",
+    "resultado {team}",
+    "próximo partido {team}",
+    "mejor {product} {year}",
+    "ofertas {product}",
+    "opiniones {product}",
+    "cómo {hobby}",
+    "{hobby} para principiantes",
+    "noticias de {topic}",
+    "últimas noticias de {topic}",
+    "qué es {topic}",
+    "curiosidades de {animal}",
+    "cuánto viven los {animal}",
+    "restaurantes de {food} en {city}",
+    "tienda de {product} {city}",
+    "{team} contra {team}",
+    "clases para {hobby} en {city}",
+    "tendencias de {topic} {year}",
+    "{animal} contra {animal}",
+    "vuelos baratos {city} {city}",
+]
+query_words = {
+    "food": ["paella", "tortilla de patatas", "gazpacho", "croquetas", "churros", "flan", "empanadas", "lentejas", "fabada", "arroz con leche", "pulpo a la gallega", "tacos"],
+    "city": ["madrid", "barcelona", "sevilla", "valencia", "bilbao", "granada", "málaga", "méxico", "buenos aires", "lima", "bogotá", "parís", "roma", "lisboa"],
+    "team": ["real madrid", "barcelona", "atlético de madrid", "sevilla", "betis", "valencia", "athletic club", "real sociedad", "boca juniors", "river plate"],
+    "product": ["portátil", "auriculares", "zapatillas de running", "freidora de aire", "reloj inteligente", "televisor", "cafetera", "aspiradora", "tablet", "cámara"],
+    "hobby": ["tejer", "tocar la guitarra", "pintar con acuarelas", "hacer un huerto", "hacer pan", "jugar al ajedrez", "meditar", "correr una maratón", "dibujar"],
+    "topic": ["tecnología", "ciencia", "economía", "salud", "clima", "cine", "música", "bolsa", "inteligencia artificial", "astronomía"],
+    "animal": ["pingüinos", "elefantes", "delfines", "búhos", "tortugas", "lobos", "pulpos", "loros", "tigres", "linces"],
+}
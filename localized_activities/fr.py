@@ -37,3 +37,42 @@ ignore = {
     "Get 100 points with search bar",
     "Safeguard your family's info",
 }
+
+query_templates = [
+    "recette {food}",
+    "comment faire {food}",
+    "{food} près de moi",
+    "météo {city}",
+    "que faire à {city}",
+    "hôtel {city}",
+    "vol pour {city}",
+    "distance {city} {city}",
+    "score {team}",
+    "prochain match {team}",
+    "meilleur {product} {year}",
+    "promo {product}",
+    "avis {product}",
+    "comment {hobby}",
+    "{hobby} pour débutant",
+    "actualité {topic}",
+    "dernières nouvelles {topic}",
+    "c'est quoi {topic}",
+    "{animal} anecdotes",
+    "espérance de vie {animal}",
+    "restaurant {food} {city}",
+    "magasin {product} {city}",
+    "{team} contre {team}",
+    "cours pour {hobby} à {city}",
+    "tendances {topic} {year}",
+    "{animal} contre {animal}",
+    "vol pas cher {city} {city}",
+]
+query_words = {
+    "food": ["quiche lorraine", "ratatouille", "crêpes", "bœuf bourguignon", "tarte tatin", "blanquette de veau", "gratin dauphinois", "cassoulet", "croque monsieur", "mousse au chocolat", "soupe à l'oignon", "galette des rois"],
+    "city": ["paris", "lyon", "marseille", "bordeaux", "toulouse", "nice", "lille", "nantes", "strasbourg", "montréal", "bruxelles", "genève", "rome", "londres"],
+    "team": ["psg", "om", "ol", "losc", "as monaco", "stade rennais", "rc lens", "ogc nice", "stade toulousain", "équipe de france"],
+    "product": ["ordinateur portable", "casque audio", "chaussures de running", "friteuse sans huile", "montre connectée", "télévision", "machine à café", "aspirateur", "tablette", "appareil photo"],
+    "hobby": ["tricoter", "jouer de la guitare", "peindre à l'aquarelle", "faire un potager", "faire son pain", "jouer aux échecs", "méditer", "courir un marathon", "dessiner"],
+    "topic": ["technologie", "science", "économie", "santé", "climat", "cinéma", "musique", "bourse", "intelligence artificielle", "espace"],
+    "animal": ["pingouin", "éléphant", "dauphin", "hibou", "tortue", "loup", "pieuvre", "perroquet", "tigre", "renard"],
+}
@@ -36,4 +36,43 @@ ignore = {
     "Get 50 entries plus 1000 points!",
     "Get 100 points with search bar",
     "Safeguard your family's info",
-}
\ No newline at end of file
+}
+
+query_templates = [
+    "ricetta {food}",
+    "come fare {food}",
+    "{food} vicino a me",
+    "meteo {city}",
+    "cosa fare a {city}",
+    "hotel {city}",
+    "voli per {city}",
+    "distanza {city} {city}",
+    "risultato {team}",
+    "prossima partita {team}",
+    "miglior {product} {year}",
+    "offerte {product}",
+    "recensioni {product}",
+    "come {hobby}",
+    "{hobby} per principianti",
+    "notizie {topic}",
+    "ultime notizie {topic}",
+    "cos'è {topic}",
+    "curiosità {animal}",
+    "quanto vive {animal}",
+    "ristorante {food} {city}",
+    "negozio {product} {city}",
+    "{team} contro {team}",
+    "corsi per {hobby} a {city}",
+    "tendenze {topic} {year}",
+    "{animal} contro {animal}",
+    "voli economici {city} {city}",
+]
+query_words = {
+    "food": ["lasagne", "carbonara", "tiramisù", "risotto alla milanese", "pizza margherita", "parmigiana", "amatriciana", "pesto alla genovese", "ossobuco", "panna cotta", "arancini", "gnocchi"],
+    "city": ["roma", "milano", "napoli", "torino", "firenze", "venezia", "bologna", "palermo", "genova", "verona", "bari", "parigi", "londra", "madrid"],
+    "team": ["juventus", "inter", "milan", "napoli", "roma", "lazio", "atalanta", "fiorentina", "torino", "bologna"],
+    "product": ["portatile", "cuffie", "scarpe da corsa", "friggitrice ad aria", "smartwatch", "televisore", "macchina del caffè", "aspirapolvere", "tablet", "fotocamera"],
+    "hobby": ["lavorare a maglia", "suonare la chitarra", "dipingere ad acquerello", "fare l'orto", "fare il pane", "giocare a scacchi", "meditare", "correre una maratona", "disegnare"],
+    "topic": ["tecnologia", "scienza", "economia", "salute", "clima", "cinema", "musica", "borsa", "intelligenza artificiale", "spazio"],
+    "animal": ["pinguino", "elefante", "delfino", "gufo", "tartaruga", "lupo", "polpo", "pappagallo", "tigre", "volpe"],
+}
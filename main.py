@@ -2,10 +2,15 @@ import csv
 import json
 import logging
 import logging.config
+import multiprocessing
 import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from enum import Enum, auto
 from logging import handlers
+from multiprocessing.connection import Connection, wait
+from typing import Iterator, NamedTuple
 
 from src import (
     Browser,
@@ -15,28 +20,48 @@ from src import (
     ReadToEarn,
 )
 from src.activities import Activities
-from src.browser import RemainingSearches
+from src.browser import CookieHandoff, RemainingSearches
 from src.loggingColoredFormatter import ColoredFormatter
-from src.utils import CONFIG, APPRISE, getProjectRoot, formatNumber
+from src.scheduler import CooperativeScheduler
+from src.trendsPool import prefetchTrends
+from src.utils import (
+    CONFIG,
+    APPRISE,
+    Config,
+    getProjectRoot,
+    formatNumber,
+    init,
+    hasWaitHook,
+    prefetchLanguageCountries,
+)
 
 
 def main():
     setupLogging()
 
+    # Geolocate every account proxy at once, rather than when each browser starts
+    prefetchLanguageCountries(CONFIG.accounts)
+    # Fetch the search keywords of every country in the background, while browsers start
+    prefetchTrends(CONFIG.accounts)
+
     # Load previous day's points data
     previous_points_data = load_previous_points_data()
 
     foundError = False
 
-    for currentAccount in CONFIG.accounts:
-        try:
-            earned_points = executeBot(currentAccount)
-        except Exception as e1:
-            logging.error("", exc_info=True)
+    for currentAccount, earned_points, error in runAccounts(CONFIG.accounts):
+        if error is not None:
+            if isinstance(error, WorkerError):
+                logging.error(
+                    f"[WORKER] Error executing {currentAccount.email}\n"
+                    f"{error.formattedTraceback}"
+                )
+            else:
+                logging.error("", exc_info=error)
             foundError = True
             if CONFIG.get("apprise.notify.uncaught-exception"):
                 APPRISE.notify(
-                    f"{type(e1).__name__}: {e1}",
+                    f"{getErrorName(error)}: {error}",
                     f"⚠️ Error executing {currentAccount.email}, please check the log",
                 )
             continue
@@ -64,6 +89,124 @@ def main():
         sys.exit(1)
 
 
+class ParallelMode(Enum):
+    """
+    configures how accounts are run when `parallel.workers` is greater than 1
+    """
+
+    PROCESS = auto()
+    """
+    the default, each account runs in its own worker process
+    """
+    ASYNC = auto()
+    """
+    accounts share one process, an event loop switches between them during waits
+    """
+
+
+class WorkerError(Exception):
+    """
+    An exception raised in a worker process, re-created in the main process.
+    """
+
+    def __init__(self, name: str, message: str, formattedTraceback: str):
+        super().__init__(message)
+        self.name = name
+        self.formattedTraceback = formattedTraceback
+
+
+def getErrorName(error: BaseException) -> str:
+    if isinstance(error, WorkerError):
+        return error.name
+    return type(error).__name__
+
+
+def runAccounts(
+    accounts: list,
+) -> Iterator[tuple[Config, int | None, BaseException | None]]:
+    """
+    Runs the bot for every account, either one after the other or, when
+    `parallel.workers` is greater than 1, according to `parallel.mode`.
+
+    Yields:
+        (account, earned points or None, error or None), in completion order
+    """
+    workers = min(CONFIG.parallel.workers, len(accounts))
+    if workers <= 1:
+        for currentAccount in accounts:
+            try:
+                earned_points = executeBot(currentAccount)
+            except Exception as e:
+                yield currentAccount, None, e
+                continue
+            yield currentAccount, earned_points, None
+        return
+
+    parallelMode = ParallelMode[CONFIG.parallel.mode]
+    logging.info(
+        f"[WORKER] Running {len(accounts)} accounts with {workers} {parallelMode.name} workers"
+    )
+    if parallelMode == ParallelMode.ASYNC:
+        yield from CooperativeScheduler(workers, CONFIG.parallel.active).run(
+            accounts, executeBot
+        )
+        return
+
+    context = multiprocessing.get_context("spawn")
+    pending = list(accounts)
+    running: dict[Connection, tuple[multiprocessing.Process, Config]] = {}
+    while pending or running:
+        while pending and len(running) < workers:
+            currentAccount = pending.pop(0)
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(
+                target=accountWorker,
+                args=(currentAccount, CONFIG, sender),
+                name=f"worker-{currentAccount.email}",
+            )
+            process.start()
+            sender.close()
+            running[receiver] = (process, currentAccount)
+
+        for receiver in wait(list(running)):
+            process, currentAccount = running.pop(receiver)
+            try:
+                earned_points, error = receiver.recv()
+            except EOFError:
+                # The worker died without reporting, e.g. killed or segfault
+                earned_points, error = None, None
+            receiver.close()
+            process.join()
+            if error is not None:
+                yield currentAccount, None, WorkerError(*error)
+            elif earned_points is None:
+                yield currentAccount, None, WorkerError(
+                    "WorkerCrashed",
+                    f"worker exited with code {process.exitcode}",
+                    "",
+                )
+            else:
+                yield currentAccount, earned_points, None
+
+
+def accountWorker(currentAccount: Config, config: Config, sender: Connection) -> None:
+    """
+    Entrypoint of a worker process, runs the bot for a single account and sends
+    back either the earned points or a description of the error.
+    """
+    init(config)
+    setupLogging(
+        f"activity-{currentAccount.email}.log", f"[{currentAccount.email}] "
+    )
+    try:
+        sender.send((executeBot(currentAccount), None))
+    except Exception as e:
+        logging.error("", exc_info=True)
+        sender.send((None, (type(e).__name__, str(e), traceback.format_exc())))
+    finally:
+        sender.close()
+
+
 def log_daily_points_to_csv(earned_points, points_difference):
     logs_directory = getProjectRoot() / "logs"
     csv_filename = logs_directory / "points_data.csv"
@@ -88,17 +231,17 @@ def log_daily_points_to_csv(earned_points, points_difference):
         writer.writerow(new_row)
 
 
-def setupLogging():
+def setupLogging(logFilename: str = "activity.log", terminalPrefix: str = ""):
     _format = CONFIG.logging.format
     terminalHandler = logging.StreamHandler(sys.stdout)
-    terminalHandler.setFormatter(ColoredFormatter(_format))
+    terminalHandler.setFormatter(ColoredFormatter(terminalPrefix + _format))
     terminalHandler.setLevel(logging.getLevelName(CONFIG.logging.level.upper()))
 
     logs_directory = getProjectRoot() / "logs"
     logs_directory.mkdir(parents=True, exist_ok=True)
 
     fileHandler = handlers.TimedRotatingFileHandler(
-        logs_directory / "activity.log",
+        logs_directory / logFilename,
         when="midnight",
         backupCount=2,
         encoding="utf-8",
@@ -138,60 +281,136 @@ class AppriseSummary(Enum):
     """
 
 
-def executeBot(currentAccount):
-    logging.info(f"********************{currentAccount.email}********************")
+class PhaseResult(NamedTuple):
+    """
+    Points and searches read at the end of a desktop or mobile phase.
+    """
 
-    startingPoints: int | None = None
+    startingPoints: int | None
     accountPoints: int
     remainingSearches: RemainingSearches
-    goalTitle: str
     goalPoints: int
+    goalTitle: str
 
-    if CONFIG.search.type in ("desktop", "both", None):
-        with Browser(mobile=False, account=currentAccount) as desktopBrowser:
-            utils = desktopBrowser.utils
+
+def executeDesktopPhase(
+    currentAccount, cookieHandoff: CookieHandoff | None = None
+) -> PhaseResult:
+    with Browser(mobile=False, account=currentAccount) as desktopBrowser:
+        utils = desktopBrowser.utils
+        loginCookies = None
+        try:
             Login(desktopBrowser).login()
+            if cookieHandoff is not None:
+                loginCookies = desktopBrowser.getCookies()
+        finally:
+            if cookieHandoff is not None:
+                # Also sent if the login failed, so the mobile phase doesn't wait
+                cookieHandoff.publish(loginCookies)
+        startingPoints = utils.getAccountPoints()
+        logging.info(
+            f"[POINTS] You have {formatNumber(startingPoints)} points on your account - Searching First"
+        )
+
+        with Searches(desktopBrowser) as searches:
+            searches.bingSearches()
+
+        # Activities After Search For Debugging
+        Activities(desktopBrowser).completeActivities()
+        PunchCards(desktopBrowser).completePunchCards()
+        # VersusGame(desktopBrowser).completeVersusGame()
+
+        goalPoints = 100 # utils.getGoalPoints()
+        goalTitle = "Title" # utils.getGoalTitle()
+
+        remainingSearches = desktopBrowser.getRemainingSearches(
+            desktopAndMobile=True
+        )
+        accountPoints = utils.getAccountPoints()
+    return PhaseResult(
+        startingPoints, accountPoints, remainingSearches, goalPoints, goalTitle
+    )
+
+
+def executeMobilePhase(
+    currentAccount,
+    readStartingPoints: bool,
+    cookieHandoff: CookieHandoff | None = None,
+) -> PhaseResult:
+    with Browser(mobile=True, account=currentAccount) as mobileBrowser:
+        utils = mobileBrowser.utils
+        if cookieHandoff is not None:
+            cookies = cookieHandoff.wait()
+            if cookies:
+                mobileBrowser.setCookies(cookies)
+        Login(mobileBrowser).login()
+        startingPoints = None
+        if readStartingPoints:
             startingPoints = utils.getAccountPoints()
-            logging.info(
-                f"[POINTS] You have {formatNumber(startingPoints)} points on your account - Searching First"
-            )
-            
-            with Searches(desktopBrowser) as searches:
-                searches.bingSearches()
-            
-            # Activities After Search For Debugging
-            Activities(desktopBrowser).completeActivities()
-            PunchCards(desktopBrowser).completePunchCards()
-            # VersusGame(desktopBrowser).completeVersusGame()
-
-            goalPoints = 100 # utils.getGoalPoints()
-            goalTitle = "Title" # utils.getGoalTitle()
-
-            remainingSearches = desktopBrowser.getRemainingSearches(
-                desktopAndMobile=True
-            )
-            accountPoints = utils.getAccountPoints()
-
-    if CONFIG.search.type in ("mobile", "both", None):
-        with Browser(mobile=True, account=currentAccount) as mobileBrowser:
-            utils = mobileBrowser.utils
-            Login(mobileBrowser).login()
-            if startingPoints is None:
-                startingPoints = utils.getAccountPoints()
-            try:
-                ReadToEarn(mobileBrowser).completeReadToEarn()
-            except Exception:
-                logging.exception("[READ TO EARN] Failed to complete Read to Earn")
-            with Searches(mobileBrowser) as searches:
-                searches.bingSearches()
+        try:
+            ReadToEarn(mobileBrowser).completeReadToEarn()
+        except Exception:
+            logging.exception("[READ TO EARN] Failed to complete Read to Earn")
+        with Searches(mobileBrowser) as searches:
+            searches.bingSearches()
+
+        goalPoints = utils.getGoalPoints()
+        goalTitle = utils.getGoalTitle()
+
+        remainingSearches = mobileBrowser.getRemainingSearches(
+            desktopAndMobile=True
+        )
+        accountPoints = utils.getAccountPoints()
+    return PhaseResult(
+        startingPoints, accountPoints, remainingSearches, goalPoints, goalTitle
+    )
 
-            goalPoints = utils.getGoalPoints()
-            goalTitle = utils.getGoalTitle()
 
-            remainingSearches = mobileBrowser.getRemainingSearches(
-                desktopAndMobile=True
+def executeBot(currentAccount):
+    logging.info(f"********************{currentAccount.email}********************")
+
+    runDesktop = CONFIG.search.type in ("desktop", "both", None)
+    runMobile = CONFIG.search.type in ("mobile", "both", None)
+    phaseResults: list[PhaseResult] = []
+
+    concurrentPhases = CONFIG.get("parallel.concurrent-phases")
+    if concurrentPhases and hasWaitHook():
+        # The phase threads would wait without giving the scheduler slot back
+        logging.warning(
+            "[WORKER] parallel.concurrent-phases is ignored with parallel.mode: ASYNC"
+        )
+        concurrentPhases = False
+
+    if runDesktop and runMobile and concurrentPhases:
+        # Each phase has its own profile, the mobile one reuses the desktop login
+        cookieHandoff = CookieHandoff()
+        with ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix=currentAccount.email
+        ) as executor:
+            desktopFuture = executor.submit(
+                executeDesktopPhase, currentAccount, cookieHandoff
             )
-            accountPoints = utils.getAccountPoints()
+            mobileFuture = executor.submit(
+                executeMobilePhase, currentAccount, False, cookieHandoff
+            )
+            phaseResults = [desktopFuture.result(), mobileFuture.result()]
+    else:
+        if runDesktop:
+            phaseResults.append(executeDesktopPhase(currentAccount))
+        if runMobile:
+            phaseResults.append(
+                executeMobilePhase(currentAccount, readStartingPoints=not runDesktop)
+            )
+
+    startingPoints = phaseResults[0].startingPoints
+    # Points only go up and searches only go down, so keep the most recent values
+    accountPoints = max(result.accountPoints for result in phaseResults)
+    remainingSearches = RemainingSearches(
+        desktop=min(result.remainingSearches.desktop for result in phaseResults),
+        mobile=min(result.remainingSearches.mobile for result in phaseResults),
+    )
+    goalPoints = phaseResults[-1].goalPoints
+    goalTitle = phaseResults[-1].goalTitle
 
     logging.info(
         f"[POINTS] You have earned {formatNumber(accountPoints - startingPoints)} points this run !"
@@ -267,6 +486,7 @@ def save_previous_points_data(data):
 
 if __name__ == "__main__":
     try:
+        init()
         main()
     except Exception as e:
         logging.exception("")
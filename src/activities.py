@@ -1,23 +1,94 @@
 import contextlib
 import logging
 from random import randint
-from time import sleep
 
-from selenium.common import TimeoutException
+from selenium.common import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.wait import WebDriverWait
 
+from src.activityTabs import ActivityTabs
 from src.browser import Browser
 from src.constants import REWARDS_URL
+from src.quizAnswers import QuizAnswers
 from src.utils import (
     CONFIG,
     APPRISE,
+    DOCUMENT_ORIGIN_SCRIPT,
     getAnswerCode,
     cooldown,
-    ACTIVITY_TITLES_TO_QUERIES,
-    IGNORED_ACTIVITIES,
+    sleep,
+    getLocalizedActivities,
 )
 
+QUIZ_STATE_SCRIPT = """
+// Not defined yet while the quiz page is still loading
+if (typeof _w === "undefined" || !_w.rewardsQuizRenderInfo) return null;
+const info = _w.rewardsQuizRenderInfo;
+const credits = document.querySelector(".rqECredits");
+const options = [];
+for (let i = 0; i < info.numberOfOptions; i++) {
+  const option = document.getElementById(`rqAnswerOption${i}`);
+  if (option) {
+    options.push({
+      id: option.id,
+      element: option,
+      isCorrectOption: option.getAttribute("iscorrectoption"),
+      dataOption: option.getAttribute("data-option"),
+    });
+  }
+}
+return {
+  maxQuestions: info.maxQuestions,
+  numberOfOptions: info.numberOfOptions,
+  correctlyAnsweredQuestionCount: info.CorrectlyAnsweredQuestionCount,
+  correctAnswer: info.correctAnswer,
+  encodeKey: typeof _G !== "undefined" ? _G.IG : null,
+  questionShown: credits !== null && credits.getClientRects().length > 0,
+  options: options,
+};
+"""
+"""
+the whole state of the current quiz question: its `rewardsQuizRenderInfo`, answer
+options with their elements and attributes, and the answer encoding key
+"""
+
+ACTIVITY_ELEMENTS_SCRIPT = """
+const normalize = (text) => text.replace(/\\u200b/g, "").replace(/\\s+/g, " ").trim();
+const elements = {};
+const byTitle = [];
+for (const activity of arguments[0]) {
+  elements[activity.id] =
+    (activity.offerId &&
+      document.querySelector(`[data-bi-id="${CSS.escape(activity.offerId)}"]`)) ||
+    null;
+  if (elements[activity.id] === null) {
+    byTitle.push({ id: activity.id, title: normalize(activity.title) });
+  }
+}
+if (byTitle.length) {
+  const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+  while (walker.nextNode()) {
+    const text = normalize(walker.currentNode.nodeValue);
+    if (!text) continue;
+    for (const activity of byTitle) {
+      if (elements[activity.id] === null && text.includes(activity.title)) {
+        elements[activity.id] = walker.currentNode.parentElement;
+      }
+    }
+  }
+}
+return elements;
+"""
+"""
+maps the id of each given activity to its card on the rewards page, found by offer id
+or else by the first text containing its title, in a single pass over the page
+"""
+
 
 class Activities:
     """
@@ -27,6 +98,17 @@ class Activities:
     def __init__(self, browser: Browser):
         self.browser = browser
         self.webdriver = browser.webdriver
+        localizedActivities = getLocalizedActivities(browser.localeLang)
+        self.activityTitlesToQueries: dict[str, str] = (
+            localizedActivities.title_to_query
+        )
+        self.ignoredActivities: set[str] = localizedActivities.ignore
+        self.activityPlan: dict[str, dict] = {}
+        self.activityElements: dict[str, WebElement | None] = {}
+        """
+        the card of each planned activity, until the rewards page is reloaded
+        """
+        self.activityElementsDocument: float | None = None
 
     def completeSearch(self):
         # Simulate completing a search activity
@@ -37,6 +119,30 @@ class Activities:
         # noinspection SpellCheckingInspection
         self.browser.utils.waitUntilClickable(By.ID, f"btoption{randint(0, 1)}").click()
 
+    def getQuizState(self, timeToWait: float = 20) -> dict:
+        """
+        Returns the state of the current quiz question in a single round trip, once the
+        question is shown or the quiz is over.
+        """
+        return WebDriverWait(self.webdriver, timeToWait).until(
+            lambda driver: (
+                (quizState := driver.execute_script(QUIZ_STATE_SCRIPT))
+                and (
+                    quizState["questionShown"]
+                    or quizState["correctlyAnsweredQuestionCount"]
+                    == quizState["maxQuestions"]
+                )
+                and quizState
+            )
+        )
+
+    def clickOption(self, option: dict) -> None:
+        try:
+            self.browser.utils.click(option["element"])
+        except StaleElementReferenceException:
+            # The question was rendered again
+            self.browser.utils.click(self.webdriver.find_element(By.ID, option["id"]))
+
     def completeQuiz(self):
         # Simulate completing a quiz activity
         with contextlib.suppress(
@@ -45,65 +151,47 @@ class Activities:
             startQuiz = self.browser.utils.waitUntilQuizLoads()
             self.browser.utils.click(startQuiz)
         self.browser.utils.waitUntilVisible(By.ID, "overlayPanel", 5)
-        maxQuestions = self.webdriver.execute_script(
-            "return _w.rewardsQuizRenderInfo.maxQuestions"
-        )
-        numberOfOptions = self.webdriver.execute_script(
-            "return _w.rewardsQuizRenderInfo.numberOfOptions"
-        )
         while True:
-            correctlyAnsweredQuestionCount: int = self.webdriver.execute_script(
-                "return _w.rewardsQuizRenderInfo.CorrectlyAnsweredQuestionCount"
-            )
+            quizState = self.getQuizState()
 
-            if correctlyAnsweredQuestionCount == maxQuestions:
+            if (
+                quizState["correctlyAnsweredQuestionCount"]
+                == quizState["maxQuestions"]
+            ):
                 return
 
-            self.browser.utils.waitUntilQuestionRefresh()
-
-            if numberOfOptions == 8:
-                answers = []
-                for i in range(numberOfOptions):
-                    isCorrectOption = self.webdriver.find_element(
-                        By.ID, f"rqAnswerOption{i}"
-                    ).get_attribute("iscorrectoption")
+            if quizState["numberOfOptions"] == 8:
+                for option in quizState["options"]:
+                    isCorrectOption = option["isCorrectOption"]
                     if isCorrectOption and isCorrectOption.lower() == "true":
-                        answers.append(f"rqAnswerOption{i}")
-                for answer in answers:
-                    element = self.webdriver.find_element(By.ID, answer)
-                    self.browser.utils.click(element)
-            elif numberOfOptions in [2, 3, 4]:
-                correctOption = self.webdriver.execute_script(
-                    "return _w.rewardsQuizRenderInfo.correctAnswer"
-                )
-                for i in range(numberOfOptions):
-                    if (
-                        self.webdriver.find_element(
-                            By.ID, f"rqAnswerOption{i}"
-                        ).get_attribute("data-option")
-                        == correctOption
-                    ):
-                        correctAnswer = self.browser.utils.waitUntilClickable(
-                            By.ID, f"rqAnswerOption{i}"
-                        )
-                        self.browser.utils.click(correctAnswer)
+                        self.clickOption(option)
+            elif quizState["numberOfOptions"] in [2, 3, 4]:
+                for option in quizState["options"]:
+                    if option["dataOption"] == quizState["correctAnswer"]:
+                        self.clickOption(option)
                         break
 
-    def completeABC(self):
+    def completeABC(self, quizId: str):
         # Simulate completing an ABC activity
         counter = self.webdriver.find_element(
             By.XPATH, '//*[@id="QuestionPane0"]/div[2]'
         ).text[:-1][1:]
         numberOfQuestions = max(int(s) for s in counter.split() if s.isdigit())
-        for question in range(numberOfQuestions):
-            element = self.webdriver.find_element(
-                By.ID, f"questionOptionChoice{question}{randint(0, 2)}"
-            )
-            self.browser.utils.click(element)
-            sleep(randint(10, 15))
-            element = self.webdriver.find_element(By.ID, f"nextQuestionbtn{question}")
-            self.browser.utils.click(element)
-            sleep(randint(10, 15))
+        with QuizAnswers(self.browser.localeGeo) as quizAnswers:
+            for question in range(numberOfQuestions):
+                choices = [
+                    f'//*[@id="questionOptionChoice{question}{choice}"]'
+                    for choice in range(3)
+                ]
+                self.browser.utils.answerQuizQuestion(
+                    quizAnswers,
+                    quizId,
+                    question,
+                    choices,
+                    (By.ID, f"nextQuestionbtn{question}"),
+                    lambda: sleep(randint(10, 15)),
+                )
+                sleep(randint(10, 15))
 
     def completeThisOrThat(self):
         # Simulate completing a This or That activity
@@ -112,95 +200,147 @@ class Activities:
         ):  # Handles in case quiz was started in previous run
             startQuiz = self.browser.utils.waitUntilQuizLoads()
             self.browser.utils.click(startQuiz)
-        self.browser.utils.waitUntilQuestionRefresh()
         for _ in range(10):
-            correctAnswerCode = self.webdriver.execute_script(
-                "return _w.rewardsQuizRenderInfo.correctAnswer"
-            )
-            answer1, answer1Code = self.getAnswerAndCode("rqAnswerOption0")
-            answer2, answer2Code = self.getAnswerAndCode("rqAnswerOption1")
-            answerToClick: WebElement
-            if answer1Code == correctAnswerCode:
-                answerToClick = answer1
-            elif answer2Code == correctAnswerCode:
-                answerToClick = answer2
-
-            self.browser.utils.click(answerToClick)
+            quizState = self.getQuizState()
+            for option in quizState["options"][:2]:
+                answerCode = getAnswerCode(quizState["encodeKey"], option["dataOption"])
+                if answerCode == quizState["correctAnswer"]:
+                    self.clickOption(option)
+                    break
             sleep(randint(10, 15))
 
-    def getAnswerAndCode(self, answerId: str) -> tuple[WebElement, str]:
-        # Helper function to get answer element and its code
-        answerEncodeKey = self.webdriver.execute_script("return _G.IG")
-        answer = self.webdriver.find_element(By.ID, answerId)
-        answerTitle = answer.get_attribute("data-option")
-        return (
-            answer,
-            getAnswerCode(answerEncodeKey, answerTitle),
+    def shouldComplete(self, activity: dict) -> bool:
+        activityTitle = cleanupActivityTitle(activity["title"])
+        logging.debug(f"activityTitle={activityTitle}")
+        if activity["complete"] or activity["pointProgressMax"] == 0:
+            logging.debug("Already done, returning")
+            return False
+        if activity["attributes"].get("is_unlocked", "True") != "True":
+            logging.debug("Activity locked, returning")
+            if activityTitle not in self.activityTitlesToQueries:
+                logging.warning(
+                    f"Add activity title '{activityTitle}' to search mapping in relevant language file in localized_activities")
+            return False
+        if activityTitle in self.ignoredActivities:
+            logging.debug(f"Ignoring {activityTitle}")
+            return False
+        # Open the activity for the activity
+        if "puzzle" in activityTitle.lower():
+            logging.info(f"Skipping {activityTitle} because it's not supported")
+            return False
+        if "Windows search" == activityTitle:
+            # for search in {"what time is it in dublin", "what is the weather"}:
+            #     pyautogui.press("win")
+            #     sleep(1)
+            #     pyautogui.write(search)
+            #     sleep(5)
+            #     pyautogui.press("enter")
+            #     sleep(5)
+            # pyautogui.hotkey("alt", "f4") # Close Edge
+            return False
+        return True
+
+    def isIndependent(self, activity: dict) -> bool:
+        """
+        Whether the activity is only a visit or a search, so it can be done in a tab
+        next to others. Quizzes and polls need the focus until they're done.
+        """
+        activityTitle = cleanupActivityTitle(activity["title"])
+        if activityTitle in self.activityTitlesToQueries:
+            return True
+        return "poll" not in activityTitle and activity["promotionType"] != "quiz"
+
+    def doActivity(self, activity: dict) -> None:
+        """
+        Does the activity in its tab, once opened.
+        """
+        activityTitle = cleanupActivityTitle(activity["title"])
+        with contextlib.suppress(TimeoutException):
+            searchbar = self.browser.utils.waitUntilClickable(
+                By.ID, "sb_form_q", timeToWait=30
+            )
+            self.browser.utils.click(searchbar)
+            searchbar.clear()
+        if activityTitle in self.activityTitlesToQueries:
+            searchbar.send_keys(self.activityTitlesToQueries[activityTitle])
+            sleep(2)
+            searchbar.submit()
+        elif "poll" in activityTitle:
+            # Complete survey for a specific scenario
+            self.completeSurvey()
+        elif activity["promotionType"] == "urlreward":
+            # Complete search for URL reward
+            self.completeSearch()
+        elif activity["promotionType"] == "quiz":
+            # Complete different types of quizzes based on point progress max
+            if activity["pointProgressMax"] == 10:
+                self.completeABC(getActivityId(activity))
+            elif activity["pointProgressMax"] in [30, 40]:
+                self.completeQuiz()
+            elif activity["pointProgressMax"] == 50:
+                self.completeThisOrThat()
+        else:
+            # Default to completing search
+            self.completeSearch()
+        logging.debug("Done")
+
+    def getActivityElement(
+        self, activity: dict, timeToWait: float = 20
+    ) -> WebElement:
+        """
+        Returns the card of the activity on the current rewards page, indexing the
+        cards of all the planned activities at once when the page was (re)loaded.
+        The cards are indexed again, for `timeToWait` seconds at most, while the one
+        of the activity is missing, as they may still be rendering.
+
+        Raises:
+            NoSuchElementException: if the card isn't on the page
+        """
+        activityId = getActivityId(activity)
+        document = self.webdriver.execute_script(DOCUMENT_ORIGIN_SCRIPT)
+        if (
+            document != self.activityElementsDocument
+            or self.activityElements.get(activityId) is None
+        ):
+            with contextlib.suppress(TimeoutException):
+                WebDriverWait(self.webdriver, timeToWait).until(
+                    lambda _: self.indexActivityElements(activity).get(activityId)
+                )
+            self.activityElementsDocument = document
+        activityElement = self.activityElements.get(activityId)
+        if activityElement is None:
+            raise NoSuchElementException(
+                f"No card for activity '{activity['title']}'"
+                f" on {self.webdriver.current_url}"
+            )
+        return activityElement
+
+    def indexActivityElements(self, activity: dict) -> dict[str, WebElement | None]:
+        self.activityElements = self.webdriver.execute_script(
+            ACTIVITY_ELEMENTS_SCRIPT,
+            [
+                {
+                    "id": activityId,
+                    "offerId": plannedActivity.get("offerId"),
+                    "title": plannedActivity["title"],
+                }
+                for activityId, plannedActivity in (
+                    self.activityPlan or {getActivityId(activity): activity}
+                ).items()
+            ],
         )
+        return self.activityElements
 
     def completeActivity(self, activity: dict) -> None:
+        activityTitle = activity["title"]
         try:
-            activityTitle = cleanupActivityTitle(activity["title"])
-            logging.debug(f"activityTitle={activityTitle}")
-            if activity["complete"] or activity["pointProgressMax"] == 0:
-                logging.debug("Already done, returning")
-                return
-            if activity["attributes"].get("is_unlocked", "True") != "True":
-                logging.debug("Activity locked, returning")
-                if activityTitle not in ACTIVITY_TITLES_TO_QUERIES:
-                    logging.warning(
-                        f"Add activity title '{activityTitle}' to search mapping in relevant language file in localized_activities")
-                return
-            if activityTitle in IGNORED_ACTIVITIES:
-                logging.debug(f"Ignoring {activityTitle}")
-                return
-            # Open the activity for the activity
-            if "puzzle" in activityTitle.lower():
-                logging.info(f"Skipping {activityTitle} because it's not supported")
-                return
-            if "Windows search" == activityTitle:
-                # for search in {"what time is it in dublin", "what is the weather"}:
-                #     pyautogui.press("win")
-                #     sleep(1)
-                #     pyautogui.write(search)
-                #     sleep(5)
-                #     pyautogui.press("enter")
-                #     sleep(5)
-                # pyautogui.hotkey("alt", "f4") # Close Edge
+            if not self.shouldComplete(activity):
                 return
-            activityElement = self.browser.utils.waitUntilClickable(
-                By.XPATH, f'//*[contains(text(), "{activity["title"]}")]', timeToWait=20
-            )
-            self.browser.utils.click(activityElement)
+            activityTitle = cleanupActivityTitle(activity["title"])
+            self.browser.utils.invalidateDashboardData()
+            self.browser.utils.click(self.getActivityElement(activity))
             self.browser.utils.switchToNewTab()
-            with contextlib.suppress(TimeoutException):
-                searchbar = self.browser.utils.waitUntilClickable(
-                    By.ID, "sb_form_q", timeToWait=30
-                )
-                self.browser.utils.click(searchbar)
-                searchbar.clear()
-            if activityTitle in ACTIVITY_TITLES_TO_QUERIES:
-                searchbar.send_keys(ACTIVITY_TITLES_TO_QUERIES[activityTitle])
-                sleep(2)
-                searchbar.submit()
-            elif "poll" in activityTitle:
-                # Complete survey for a specific scenario
-                self.completeSurvey()
-            elif activity["promotionType"] == "urlreward":
-                # Complete search for URL reward
-                self.completeSearch()
-            elif activity["promotionType"] == "quiz":
-                # Complete different types of quizzes based on point progress max
-                if activity["pointProgressMax"] == 10:
-                    self.completeABC()
-                elif activity["pointProgressMax"] in [30, 40]:
-                    self.completeQuiz()
-                elif activity["pointProgressMax"] == 50:
-                    self.completeThisOrThat()
-            else:
-                # Default to completing search
-                self.completeSearch()
-            logging.debug("Done")
+            self.doActivity(activity)
         except Exception:
             logging.error(f"[ACTIVITY] Error doing {activityTitle}", exc_info=True)
             logging.debug(f"activity={activity}")
@@ -209,22 +349,66 @@ class Activities:
             self.browser.utils.resetTabs()
         cooldown()
 
+    def completeActivitiesInTabs(self, activities: list[dict], tabs: int) -> None:
+        """
+        Does the visit and search activities in up to `tabs` tabs at the same time,
+        each one kept open for its own cooldown, then the other activities one by one.
+        """
+        exclusiveActivities: list[dict] = []
+        with ActivityTabs(self.browser, tabs) as activityTabs:
+            for activity in activities:
+                activityTitle = activity["title"]
+                try:
+                    if not self.shouldComplete(activity):
+                        continue
+                    if not self.isIndependent(activity):
+                        exclusiveActivities.append(activity)
+                        continue
+                    activityTitle = cleanupActivityTitle(activity["title"])
+                    self.browser.utils.invalidateDashboardData()
+                    activityTabs.open(lambda: self.getActivityElement(activity))
+                    self.doActivity(activity)
+                except Exception:
+                    logging.error(
+                        f"[ACTIVITY] Error doing {activityTitle}", exc_info=True
+                    )
+                    logging.debug(f"activity={activity}")
+        for activity in exclusiveActivities:
+            self.completeActivity(activity)
+
     def completeActivities(self):
         logging.info("[ACTIVITIES] " + "Trying to complete all activities...")
-        for activity in self.browser.utils.getActivities():
-            self.completeActivity(activity)
+        # Everything is planned from a single dashboard snapshot
+        activityPlan = {
+            getActivityId(activity): activity
+            for activity in self.browser.utils.getActivities()
+        }
+        self.activityPlan = activityPlan
+        # The dashboard data may come from a snapshot taken on another page
+        self.browser.utils.goToRewards()
+        tabs = CONFIG.get("parallel.activity-tabs") or 1
+        if tabs > 1:
+            self.completeActivitiesInTabs(list(activityPlan.values()), tabs)
+        else:
+            for activity in activityPlan.values():
+                self.completeActivity(activity)
         logging.info("[ACTIVITIES] " + "Done")
 
         # todo Send one email for all accounts?
         if CONFIG.get("apprise.notify.incomplete-activity"):  # todo Use fancy new way
+            # One fresh snapshot, only its counters are compared with the plan
+            pointProgresses = {
+                getActivityId(activity): activity["pointProgress"]
+                for activity in self.browser.utils.getActivities()
+            }
             incompleteActivities: list[str] = []
-            for activity in self.browser.utils.getActivities():  # Have to refresh
+            for activityId, activity in activityPlan.items():
                 activityTitle = cleanupActivityTitle(activity["title"])
                 if (
-                    activityTitle not in IGNORED_ACTIVITIES
-                    and activity["pointProgress"] < activity["pointProgressMax"]
+                    activityTitle not in self.ignoredActivities
+                    and pointProgresses.get(activityId, activity["pointProgressMax"])
+                    < activity["pointProgressMax"]
                     and activity["attributes"].get("is_unlocked", "True") == "True"
-                    # todo Add check whether activity was in original set, in case added in between
                 ):
                     incompleteActivities.append(activityTitle)
             if incompleteActivities:
@@ -237,3 +421,10 @@ class Activities:
 
 def cleanupActivityTitle(activityTitle: str) -> str:
     return activityTitle.replace("\u200b", "").replace("\xa0", " ")
+
+
+def getActivityId(activity: dict) -> str:
+    """
+    Returns an id of the activity that stays the same between dashboard snapshots.
+    """
+    return activity.get("offerId") or activity.get("name") or activity["title"]
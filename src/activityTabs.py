@@ -0,0 +1,79 @@
+import logging
+import time
+from collections import deque
+from typing import Callable
+
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.wait import WebDriverWait
+
+from src.browser import Browser
+from src.constants import REWARDS_URL
+from src.utils import TAB_POLL_FREQUENCY, getCooldownTime, sleep
+
+
+class ActivityTabs:
+    """
+    A bounded pool of tabs for activities that don't depend on each other. Each
+    activity is opened in its own tab from the rewards tab, and the tab is kept open
+    for the activity's cooldown while the next activities start, rather than waiting
+    for every cooldown one after the other.
+    """
+
+    def __init__(self, browser: Browser, size: int):
+        self.browser = browser
+        self.webdriver = browser.webdriver
+        self.size = size
+        self.rewardsTab = self.webdriver.current_window_handle
+        self.tabs: deque[tuple[str, float]] = deque()
+        """
+        the open activity tabs, oldest first, with when their cooldown ends
+        (`time.monotonic`)
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        while self.tabs:
+            self.closeOldest()
+        self.browser.utils.resetTabs()
+
+    def open(
+        self, findActivityElement: Callable[[], WebElement], timeToWait: float = 20
+    ) -> None:
+        """
+        Clicks the activity element of the rewards page once a tab is available, and
+        switches to the tab it opens.
+        """
+        if len(self.tabs) >= self.size:
+            self.closeOldest()
+        self.webdriver.switch_to.window(self.rewardsTab)
+        if self.webdriver.current_url != REWARDS_URL:
+            self.browser.utils.goToRewards()
+        activityElement = findActivityElement()
+        knownTabs = set(self.webdriver.window_handles)
+        self.browser.utils.click(activityElement)
+        newTab = WebDriverWait(
+            self.webdriver, timeToWait, poll_frequency=TAB_POLL_FREQUENCY
+        ).until(
+            lambda driver: next(
+                (tab for tab in driver.window_handles if tab not in knownTabs), False
+            )
+        )
+        cooldownTime = getCooldownTime()
+        logging.info(f"[COOLDOWN] Keeping the activity tab for {cooldownTime} seconds")
+        self.tabs.append((newTab, time.monotonic() + cooldownTime))
+        self.webdriver.switch_to.window(newTab)
+        self.browser.utils.blockRequests("quiz")
+        self.browser.utils.waitUntilReady("activity")
+
+    def closeOldest(self) -> None:
+        """
+        Closes the oldest activity tab once its cooldown is over.
+        """
+        tab, cooldownEnd = self.tabs.popleft()
+        sleep(max(0.0, cooldownEnd - time.monotonic()))
+        if tab in self.webdriver.window_handles:
+            self.webdriver.switch_to.window(tab)
+            self.webdriver.close()
+        self.webdriver.switch_to.window(self.rewardsTab)
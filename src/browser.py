@@ -1,16 +1,24 @@
+import contextlib
 import logging
 import os
 import random
+import threading
 from pathlib import Path
 from types import TracebackType
-from typing import Any, Type
+from typing import Any, Callable, Type
+from urllib.parse import urlparse
 
+import psutil
 import seleniumwire.undetected_chromedriver as webdriver
 import undetected_chromedriver
 from selenium.webdriver import ChromeOptions
 from selenium.webdriver.chrome.webdriver import WebDriver
 
 from src import RemainingSearches
+from src.browserSession import BrowserSession
+from src.cache import JsonCache, fileLock, getCacheDir
+from src.proxyForwarder import ProxyForwarder
+from src.requestBlocker import RequestBlocker
 from src.userAgentGenerator import GenerateUserAgent
 from src.utils import (
     CONFIG,
@@ -18,10 +26,64 @@ from src.utils import (
     getBrowserConfig,
     getProjectRoot,
     saveBrowserConfig,
-    PREFER_BING_INFO, LANGUAGE, COUNTRY,
+    PREFER_BING_INFO,
+    getLanguageCountry,
+    hasWaitHook,
 )
 
 
+COOKIE_PARAM_KEYS = (
+    "name",
+    "value",
+    "domain",
+    "path",
+    "secure",
+    "httpOnly",
+    "sameSite",
+    "expires",
+)
+"""
+keys of `Network.getAllCookies` cookies accepted by `Network.setCookies`
+"""
+
+
+CHROME_VERSION_CACHE = JsonCache("chrome_version")
+DRIVER_LOCK = threading.Lock()
+"""
+serializes the creation of drivers by the threads of this process, which a lock file
+doesn't on every platform
+"""
+
+
+class CookieHandoff:
+    """
+    Hands the login cookies of one browser over to another one running concurrently.
+    """
+
+    def __init__(self):
+        self.cookies: list[dict] | None = None
+        self.published = threading.Event()
+
+    def publish(self, cookies: list[dict] | None) -> None:
+        """
+        Publishes the cookies, `None` if the login failed. Only the first call counts.
+        """
+        if not self.published.is_set():
+            self.cookies = cookies
+            self.published.set()
+
+    def wait(self, timeout: float = 600) -> list[dict] | None:
+        """
+        Waits for the cookies to be published.
+
+        Returns:
+            the cookies, or None if the login failed or took longer than `timeout`
+        """
+        if not self.published.wait(timeout):
+            logging.warning("[LOGIN] Timed out waiting for the shared login cookies")
+        return self.cookies
+
+
 class Browser:
     """WebDriver wrapper class."""
 
@@ -36,22 +98,27 @@ class Browser:
         self.email = account.email
         self.password = account.password
         self.totp = account.get("totp")
-        self.localeLang, self.localeGeo = LANGUAGE, COUNTRY
         self.proxy = CONFIG.browser.proxy
         if not self.proxy and account.get("proxy"):
             self.proxy = account.proxy
+        self.localeLang, self.localeGeo = getLanguageCountry(self.proxy)
+        self.proxyForwarder: ProxyForwarder | None = None
         self.userDataDir = self.setupProfiles()
         self.browserConfig = getBrowserConfig(self.userDataDir)
+        self.session = BrowserSession()
         (
             self.userAgent,
             self.userAgentMetadata,
             newBrowserConfig,
-        ) = GenerateUserAgent().userAgent(self.browserConfig, mobile)
+        ) = GenerateUserAgent(self.session).userAgent(self.browserConfig, mobile)
         if newBrowserConfig:
             self.browserConfig = newBrowserConfig
             saveBrowserConfig(self.userDataDir, self.browserConfig)
         self.webdriver = self.browserSetup()
-        self.utils = Utils(self.webdriver)
+        self.session.headers["User-Agent"] = self.userAgent
+        self.session.attach(self.webdriver)
+        self.requestBlocker = RequestBlocker(self.webdriver)
+        self.utils = Utils(self.webdriver, self.session, self.requestBlocker)
         logging.debug("out __init__")
 
     def __enter__(self):
@@ -68,9 +135,16 @@ class Browser:
         logging.debug(
             f"in __exit__ exc_type={exc_type} exc_value={exc_value} traceback={traceback}"
         )
+        logging.debug(f"[BROWSER] Resource usage: {self.getResourceUsage()}")
         # turns out close is needed for undetected_chromedriver
         self.webdriver.close()
         self.webdriver.quit()
+        if self.proxyForwarder is not None:
+            self.proxyForwarder.close()
+        self.session.close()
+        logging.info(
+            f"[BROWSER] {self.browserType.capitalize()} {self.requestBlocker.report()}"
+        )
 
     def browserSetup(
         self,
@@ -83,9 +157,6 @@ class Browser:
         options.add_argument(
             "--blink-settings=imagesEnabled=false"
         )  # If you are having MFA sign in issues comment this line out
-        options.add_argument("--ignore-certificate-errors")
-        options.add_argument("--ignore-certificate-errors-spki-list")
-        options.add_argument("--ignore-ssl-errors")
         if os.path.exists("/.dockerenv"):
             options.add_argument("--disable-dev-shm-usage")
             options.add_argument("--headless=new")
@@ -98,37 +169,52 @@ class Browser:
         options.add_argument("--disable-features=PrivacySandboxSettings4")
         options.add_argument("--disable-http2")
         options.add_argument("--disable-search-engine-choice-screen")  # 153
-        options.page_load_strategy = "normal"
-
-        seleniumwireOptions: dict[str, Any] = {"verify_ssl": False}
-
-        if self.proxy:
-            # Setup proxy if provided
-            seleniumwireOptions["proxy"] = {
-                "http": self.proxy,
-                "https": self.proxy,
-                "no_proxy": "localhost,127.0.0.1",
-            }
-        driver = None
+        options.page_load_strategy = CONFIG.get("browser.page-load-strategy")
 
+        driverOptions: dict[str, Any] = {
+            "options": options,
+            "user_data_dir": self.userDataDir.as_posix(),
+            "enable_cdp_events": True,
+        }
         if os.path.exists("/.dockerenv"):
-            driver = webdriver.Chrome(
-                options=options,
-                seleniumwire_options=seleniumwireOptions,
-                user_data_dir=self.userDataDir.as_posix(),
-                driver_executable_path="/usr/bin/chromedriver",
-            )
+            driverOptions["driver_executable_path"] = "/usr/bin/chromedriver"
         else:
             # Obtain webdriver chrome driver version
             version = self.getChromeVersion()
-            major = int(version.split(".")[0])
-
-            driver = webdriver.Chrome(
-                options=options,
+            driverOptions["version_main"] = int(version.split(".")[0])
+
+        if self.needsSeleniumWire():
+            options.add_argument("--ignore-certificate-errors")
+            options.add_argument("--ignore-certificate-errors-spki-list")
+            options.add_argument("--ignore-ssl-errors")
+            seleniumwireOptions: dict[str, Any] = {
+                "verify_ssl": False,
+                # Nothing reads captured requests back, keep few and off the disk
+                "request_storage": "memory",
+                "request_storage_max_size": CONFIG.get("browser.capture.max-entries"),
+            }
+            if self.proxy:
+                # Setup proxy if provided
+                seleniumwireOptions["proxy"] = {
+                    "http": self.proxy,
+                    "https": self.proxy,
+                    "no_proxy": "localhost,127.0.0.1",
+                }
+            driver = self.createDriver(
+                webdriver.Chrome,
                 seleniumwire_options=seleniumwireOptions,
-                user_data_dir=self.userDataDir.as_posix(),
-                version_main=major,
+                **driverOptions,
             )
+            driver.scopes = CONFIG.get("browser.capture.scopes") or []
+        else:
+            if self.proxy:
+                proxyServer = self.proxy
+                if urlparse(self.proxy).username:
+                    # Chrome doesn't take proxy credentials, add them locally
+                    self.proxyForwarder = ProxyForwarder(self.proxy)
+                    proxyServer = self.proxyForwarder.start()
+                options.add_argument(f"--proxy-server={proxyServer}")
+            driver = self.createDriver(undetected_chromedriver.Chrome, **driverOptions)
 
         seleniumLogger = logging.getLogger("seleniumwire")
         seleniumLogger.setLevel(logging.ERROR)
@@ -199,10 +285,60 @@ class Browser:
 
         return driver
 
+    def needsSeleniumWire(self) -> bool:
+        """
+        Selenium-wire decrypts all the browser traffic in a Python proxy, so it's only
+        used when configured or when Chrome can't use the proxy by itself
+        (SOCKS proxies with credentials).
+        """
+        if CONFIG.get("browser.selenium-wire"):
+            return True
+        if not self.proxy:
+            return False
+        parsedProxy = urlparse(self.proxy)
+        return bool(parsedProxy.username) and parsedProxy.scheme not in (
+            "http",
+            "https",
+        )
+
+    def getResourceUsage(self) -> dict[str, int]:
+        """
+        Returns the memory used by the Chrome processes and by the bot process (shared
+        by the browsers it runs), and how many requests selenium-wire keeps and their
+        size, in bytes.
+        """
+        usage = {"botRss": psutil.Process().memory_info().rss, "chromeRss": 0}
+        with contextlib.suppress(psutil.Error, AttributeError):
+            chrome = psutil.Process(self.webdriver.browser_pid)
+            for process in [chrome, *chrome.children(recursive=True)]:
+                with contextlib.suppress(psutil.NoSuchProcess):
+                    usage["chromeRss"] += process.memory_info().rss
+        if isinstance(self.webdriver, webdriver.Chrome):
+            capturedRequests = self.webdriver.requests
+            usage["capturedRequests"] = len(capturedRequests)
+            usage["capturedBytes"] = sum(
+                len(request.body or b"")
+                + (len(request.response.body or b"") if request.response else 0)
+                for request in capturedRequests
+            )
+        return usage
+
+    @staticmethod
+    def createDriver(chrome: Callable[..., WebDriver], **kwargs: Any) -> WebDriver:
+        """
+        Creates a driver, one at a time across worker processes and threads (e.g.
+        concurrent phases): undetected_chromedriver deletes and patches again its
+        shared chromedriver binary while creating a driver, without locking.
+        """
+        with DRIVER_LOCK, fileLock(getCacheDir() / "chromedriver.lock"):
+            return chrome(**kwargs)
+
     def setupProfiles(self) -> Path:
         """
         Sets up the sessions profile for the chrome browser.
-        Uses the email to create a unique profile for the session.
+        Uses the email to create a unique profile for the session, and the browser
+        type too with `parallel.concurrent-phases`, so the desktop and mobile browsers
+        can run at the same time (Chrome locks its profile directory).
 
         Returns:
             Path
@@ -210,14 +346,60 @@ class Browser:
         sessionsDir = getProjectRoot() / "sessions"
 
         # Concatenate email and browser type for a plain text session ID
-        sessionid = f"{self.email}"
-
-        sessionsDir = sessionsDir / sessionid
+        sessionsDir = sessionsDir / self.email
+        # The phases run one after the other in the cooperative scheduler
+        if not CONFIG.get("parallel.concurrent-phases") or hasWaitHook():
+            sessionsDir.mkdir(parents=True, exist_ok=True)
+            return sessionsDir
+        sharedConfig = getBrowserConfig(sessionsDir)
+        sessionsDir = sessionsDir / self.browserType
         sessionsDir.mkdir(parents=True, exist_ok=True)
+        if sharedConfig is not None and getBrowserConfig(sessionsDir) is None:
+            # Keeps the user agents of the shared profile
+            saveBrowserConfig(sessionsDir, sharedConfig)
         return sessionsDir
 
+    def getCookies(self) -> list[dict]:
+        """
+        Returns all the cookies of the browser, for every domain.
+        """
+        return self.webdriver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+
+    def setCookies(self, cookies: list[dict]) -> None:
+        """
+        Adds cookies returned by `getCookies`, possibly from another browser.
+        """
+        cookieParams = []
+        for cookie in cookies:
+            cookieParam = {
+                key: cookie[key]
+                for key in COOKIE_PARAM_KEYS
+                if cookie.get(key) is not None
+            }
+            if cookie.get("session"):
+                cookieParam.pop("expires", None)
+            cookieParams.append(cookieParam)
+        self.webdriver.execute_cdp_cmd("Network.setCookies", {"cookies": cookieParams})
+
     @staticmethod
     def getChromeVersion() -> str:
+        """
+        Returns the version of the installed Chrome.
+        Launching Chrome is slow, so it's cached by binary path and modification time.
+        """
+        binaryPath = undetected_chromedriver.find_chrome_executable()
+        if not binaryPath:
+            return Browser.launchChromeForVersion()
+        mtime = os.path.getmtime(binaryPath)
+        cachedEntry = CHROME_VERSION_CACHE.getEntry(binaryPath)
+        if cachedEntry and cachedEntry.get("mtime") == mtime:
+            return cachedEntry["value"]
+        version = Browser.launchChromeForVersion()
+        CHROME_VERSION_CACHE.set(binaryPath, version, mtime=mtime)
+        return version
+
+    @staticmethod
+    def launchChromeForVersion() -> str:
         chrome_options = ChromeOptions()
         chrome_options.add_argument("--headless=new")
         chrome_options.add_argument("--no-sandbox")
@@ -0,0 +1,160 @@
+import contextlib
+import logging
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+from requests import Session
+from requests.cookies import create_cookie
+from selenium.webdriver.chrome.webdriver import WebDriver
+
+from src.utils import makeRequestsSession
+
+MAX_TRACKED_REQUESTS = 1000
+
+
+class BrowserSession(Session):
+    """
+    A connection-pooled requests session living as long as its browser.
+
+    Its cookie jar is copied from the browser once, then kept up to date from the
+    `Set-Cookie` headers the browser receives, reported through CDP network events,
+    so requests don't have to copy every cookie from the webdriver each time.
+    Requests depending on the login still copy them all first (`syncAllCookies`), as
+    the headers are reported late and cookies set by scripts aren't reported at all.
+    """
+
+    def __init__(self, webdriver: WebDriver | None = None):
+        super().__init__()
+        makeRequestsSession(self)
+        self.webdriver: WebDriver | None = None
+        self.needsFullSync = True
+        """
+        whether the cookie jar has to be copied again from the browser before the
+        next request, e.g. when a cookie couldn't be applied incrementally
+        """
+        self.requestUrls: dict[str, str] = {}
+        """
+        the url of each CDP network request id, to know the domain of host-only cookies
+        """
+        if webdriver is not None:
+            self.attach(webdriver)
+
+    def attach(self, webdriver: WebDriver) -> None:
+        """
+        Starts following the cookies of the webdriver, which must have been started
+        with `enable_cdp_events=True` for incremental updates.
+        """
+        self.webdriver = webdriver
+        self.needsFullSync = True
+        if hasattr(webdriver, "add_cdp_listener"):
+            webdriver.add_cdp_listener(
+                "Network.requestWillBeSent", self.onRequestWillBeSent
+            )
+            webdriver.add_cdp_listener(
+                "Network.responseReceivedExtraInfo", self.onResponseReceivedExtraInfo
+            )
+
+    def request(self, method, url, *args, **kwargs):
+        if self.needsFullSync and self.webdriver is not None:
+            self.syncAllCookies()
+        return super().request(method, url, *args, **kwargs)
+
+    def syncAllCookies(self) -> None:
+        """
+        Replaces the cookie jar with all the cookies of the browser.
+        """
+        self.needsFullSync = False
+        cookies = self.webdriver.execute_cdp_cmd("Network.getAllCookies", {})[
+            "cookies"
+        ]
+        self.cookies.clear()
+        for cookie in cookies:
+            self.cookies.set_cookie(
+                create_cookie(
+                    cookie["name"],
+                    cookie["value"],
+                    domain=cookie["domain"],
+                    path=cookie["path"],
+                    secure=cookie.get("secure", False),
+                    expires=(
+                        None if cookie.get("session") else int(cookie["expires"])
+                    ),
+                )
+            )
+
+    def onRequestWillBeSent(self, message: dict) -> None:
+        params = message["params"]
+        if len(self.requestUrls) >= MAX_TRACKED_REQUESTS:
+            # Requests without response extra info are never popped
+            del self.requestUrls[next(iter(self.requestUrls))]
+        self.requestUrls[params["requestId"]] = params["request"]["url"]
+
+    def onResponseReceivedExtraInfo(self, message: dict) -> None:
+        params = message["params"]
+        requestUrl = self.requestUrls.pop(params["requestId"], None)
+        setCookieHeader = next(
+            (
+                value
+                for name, value in params.get("headers", {}).items()
+                if name.lower() == "set-cookie"
+            ),
+            None,
+        )
+        if not setCookieHeader:
+            return
+        blockedCookieLines = {
+            blockedCookie.get("cookieLine")
+            for blockedCookie in params.get("blockedCookies", [])
+        }
+        for cookieLine in setCookieHeader.split("\n"):
+            if cookieLine in blockedCookieLines:
+                continue
+            try:
+                self.applySetCookie(cookieLine, requestUrl)
+            except (ValueError, TypeError, IndexError):
+                logging.debug(f"[SESSION] Unparsable cookie '{cookieLine}'")
+                self.needsFullSync = True
+
+    def applySetCookie(self, cookieLine: str, requestUrl: str | None) -> None:
+        """
+        Applies a `Set-Cookie` header line received by the browser to the cookie jar.
+        """
+        nameValue, *attributeParts = cookieLine.split(";")
+        name, value = nameValue.strip().split("=", 1)
+        attributes: dict[str, str] = {}
+        for attributePart in attributeParts:
+            key, _, attributeValue = attributePart.strip().partition("=")
+            attributes[key.lower()] = attributeValue.strip()
+
+        domain = attributes.get("domain")
+        if not domain:
+            if requestUrl is None:
+                # Host-only cookie from an unknown request
+                self.needsFullSync = True
+                return
+            domain = urlparse(requestUrl).hostname
+        elif not domain.startswith("."):
+            domain = f".{domain}"
+        path = attributes.get("path") or "/"
+
+        expires: float | None = None
+        if "max-age" in attributes:
+            expires = time.time() + int(attributes["max-age"])
+        elif "expires" in attributes:
+            expires = parsedate_to_datetime(attributes["expires"]).timestamp()
+
+        if expires is not None and expires <= time.time():
+            with contextlib.suppress(KeyError):
+                self.cookies.clear(domain, path, name)
+            return
+        self.cookies.set_cookie(
+            create_cookie(
+                name,
+                value,
+                domain=domain,
+                path=path,
+                secure="secure" in attributes,
+                expires=None if expires is None else int(expires),
+            )
+        )
@@ -0,0 +1,127 @@
+import contextlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+from src.utils import getProjectRoot
+
+
+def getCacheDir() -> Path:
+    return getProjectRoot() / "cache"
+
+
+@contextlib.contextmanager
+def fileLock(path: Path) -> Iterator[None]:
+    """
+    Holds an exclusive lock on the file (created if needed) against other processes,
+    waiting as long as it takes.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as lockFile:
+        if os.name == "nt":
+            lockFile.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lockFile.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # Still locked after 10 seconds
+                    continue
+            try:
+                yield
+            finally:
+                lockFile.seek(0)
+                msvcrt.locking(lockFile.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(lockFile, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lockFile, fcntl.LOCK_UN)
+
+
+WRITE_LOCK = threading.Lock()
+"""
+serializes the writes of the threads of this process, the lock files those of other
+processes
+"""
+
+
+class JsonCache:
+    """
+    A small key-value cache stored as a JSON file in the `cache` folder.
+
+    Each entry keeps its value, the time it was stored and any extra metadata given
+    to `set`. The file is replaced atomically on write, and writes are serialized with
+    a lock file, so it can be shared by several threads and processes.
+    """
+
+    def __init__(self, name: str, ttl: float | None = None):
+        self.path = getCacheDir() / f"{name}.json"
+        self.ttl = ttl
+        """
+        how many seconds an entry is fresh, `None` for forever
+        """
+
+    def load(self) -> dict[str, dict]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            logging.warning(f"[CACHE] Ignoring corrupted cache file '{self.path}'")
+            return {}
+
+    def save(self, entries: dict[str, dict]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmpPath = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmpPath, self.path)
+        except BaseException:
+            Path(tmpPath).unlink(missing_ok=True)
+            raise
+
+    def getEntry(self, key: str) -> dict | None:
+        """
+        Returns the entry with its metadata, even if it expired.
+        """
+        return self.load().get(key)
+
+    def isFresh(self, entry: dict) -> bool:
+        return self.ttl is None or time.time() - entry["time"] < self.ttl
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Returns the value if it's in the cache and still fresh, else `default`.
+        """
+        entry = self.getEntry(key)
+        if entry is None or not self.isFresh(entry):
+            return default
+        return entry["value"]
+
+    def set(self, key: str, value: Any, **metadata: Any) -> None:
+        with self.lock():
+            entries = self.load()
+            entries[key] = {"value": value, "time": time.time(), **metadata}
+            self.save(entries)
+
+    @contextlib.contextmanager
+    def lock(self) -> Iterator[None]:
+        """
+        Locks the cache file against the writes of other threads and processes, so
+        none of their entries is lost between reading and replacing the file.
+        """
+        with WRITE_LOCK, fileLock(self.path.with_suffix(".lock")):
+            yield
@@ -0,0 +1,57 @@
+import random
+import re
+from datetime import date
+from typing import Iterator
+
+from src.utils import getLocalizedActivities
+
+SLOT_PATTERN = re.compile(r"{(\w+)}")
+
+
+class KeywordGenerator:
+    """
+    Generates plausible search queries offline, by filling the `query_templates` of
+    the localized activities with random `query_words` (and `{year}` with the current
+    year), used when Google Trends aren't available.
+    """
+
+    def __init__(self, language: str, seed: int | None = None):
+        localizedActivities = getLocalizedActivities(language)
+        self.templates: list[list[str]] = [
+            SLOT_PATTERN.split(template)
+            for template in localizedActivities.query_templates
+        ]
+        """
+        each template split into literal text (even indexes) and slot names (odd ones)
+        """
+        self.words: dict[str, list[str]] = {
+            **localizedActivities.query_words,
+            "year": [str(date.today().year)],
+        }
+        self.random = random.Random(seed)
+
+    def generateOne(self) -> str:
+        parts = self.random.choice(self.templates)
+        slots = parts[1::2]
+        # Different words for a slot used twice, e.g. no "paris to paris"
+        words = {
+            slot: iter(self.random.sample(self.words[slot], slots.count(slot)))
+            for slot in set(slots)
+        }
+        return "".join(
+            next(words[part]) if i % 2 else part for i, part in enumerate(parts)
+        )
+
+    def generate(self, count: int) -> Iterator[str]:
+        """
+        Yields up to `count` distinct queries, fewer only if the templates can't make
+        that many.
+        """
+        generated: set[str] = set()
+        attempts = 0
+        while len(generated) < count and attempts < count * 20:
+            attempts += 1
+            query = self.generateOne()
+            if query not in generated:
+                generated.add(query)
+                yield query
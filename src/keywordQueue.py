@@ -0,0 +1,180 @@
+import contextlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from src.utils import getProjectRoot
+
+KEYWORDS_TTL = 24 * 60 * 60
+"""
+how many seconds a keyword stays in the queue, and can't be added again once searched
+"""
+
+
+class KeywordQueue:
+    """
+    A FIFO queue of search keywords per country, stored in SQLite so it can be
+    shared by several processes.
+
+    Searched keywords are kept (marked as used) until they expire, so the same
+    keyword isn't queued twice within `KEYWORDS_TTL`.
+    """
+
+    def __init__(self, path: Path | None = None, ttl: float = KEYWORDS_TTL):
+        self.path = path or getProjectRoot() / "google_trends.sqlite3"
+        self.ttl = ttl
+        self.connection = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None
+        )
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS keywords (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                country TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                addedAt REAL NOT NULL,
+                usedAt REAL,
+                UNIQUE (country, keyword)
+            )
+            """
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS keywordsQueue ON keywords (country, usedAt, id)"
+        )
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS fetches (
+                country TEXT PRIMARY KEY,
+                startedAt REAL NOT NULL,
+                finishedAt REAL
+            )
+            """
+        )
+        self.deleteExpired()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def deleteExpired(self) -> None:
+        self.connection.execute(
+            "DELETE FROM keywords WHERE addedAt < ?", (time.time() - self.ttl,)
+        )
+
+    def add(self, country: str, keywords: Iterable[str]) -> int:
+        """
+        Queues the keywords, ignoring those already queued or searched.
+
+        Returns:
+            how many keywords were queued
+        """
+        now = time.time()
+        cursor = self.connection.executemany(
+            "INSERT OR IGNORE INTO keywords (country, keyword, addedAt) VALUES (?, ?, ?)",
+            ((country, keyword, now) for keyword in keywords),
+        )
+        return cursor.rowcount
+
+    def pop(self, country: str) -> str | None:
+        """
+        Returns the oldest queued keyword for the country and marks it as used.
+
+        Returns:
+            the keyword, or None if the queue is empty
+        """
+        with self.transaction():
+            row = self.connection.execute(
+                "SELECT id, keyword FROM keywords"
+                " WHERE country = ? AND usedAt IS NULL AND addedAt >= ?"
+                " ORDER BY id LIMIT 1",
+                (country, time.time() - self.ttl),
+            ).fetchone()
+            if row is None:
+                return None
+            self.connection.execute(
+                "UPDATE keywords SET usedAt = ? WHERE id = ?", (time.time(), row[0])
+            )
+        return row[1]
+
+    def count(self, country: str) -> int:
+        """
+        Returns how many keywords are queued for the country.
+        """
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM keywords"
+            " WHERE country = ? AND usedAt IS NULL AND addedAt >= ?",
+            (country, time.time() - self.ttl),
+        ).fetchone()[0]
+
+    def claimFetch(self, country: str, refreshAfter: float, timeout: float) -> bool:
+        """
+        Marks the keywords of the country as being fetched, unless they were fetched
+        less than `refreshAfter` seconds ago or another fetch started less than
+        `timeout` seconds ago, possibly in another process.
+
+        Returns:
+            whether the caller has to fetch the keywords
+        """
+        now = time.time()
+        with self.transaction():
+            row = self.connection.execute(
+                "SELECT startedAt, finishedAt FROM fetches WHERE country = ?",
+                (country,),
+            ).fetchone()
+            if row is not None:
+                startedAt, finishedAt = row
+                if finishedAt is not None and finishedAt > now - refreshAfter:
+                    return False
+                if finishedAt is None and startedAt > now - timeout:
+                    return False
+            self.connection.execute(
+                "INSERT OR REPLACE INTO fetches (country, startedAt) VALUES (?, ?)",
+                (country, now),
+            )
+        return True
+
+    def finishFetch(self, country: str, succeeded: bool) -> None:
+        """
+        Ends a fetch claimed with `claimFetch`, a failed one can be claimed again at once.
+        """
+        if succeeded:
+            self.connection.execute(
+                "UPDATE fetches SET finishedAt = ? WHERE country = ?",
+                (time.time(), country),
+            )
+        else:
+            self.connection.execute("DELETE FROM fetches WHERE country = ?", (country,))
+
+    def isFetching(self, country: str, timeout: float) -> bool:
+        """
+        Returns whether the keywords of the country are being fetched.
+        """
+        return (
+            self.connection.execute(
+                "SELECT 1 FROM fetches"
+                " WHERE country = ? AND finishedAt IS NULL AND startedAt > ?",
+                (country, time.time() - timeout),
+            ).fetchone()
+            is not None
+        )
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Takes the database write lock up front, so concurrent pops (from other
+        processes too) can't return the same keyword.
+        """
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
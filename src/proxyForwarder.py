@@ -0,0 +1,126 @@
+import asyncio
+import base64
+import contextlib
+import logging
+import threading
+from urllib.parse import unquote, urlparse
+
+HEAD_END = b"\r\n\r\n"
+
+
+class ProxyForwarder:
+    """
+    A local HTTP proxy without credentials, forwarding everything to an upstream
+    HTTP(S) proxy with its credentials, since Chrome's `--proxy-server` doesn't take
+    any. HTTPS traffic is tunneled as is, never decrypted.
+    """
+
+    def __init__(self, upstreamProxy: str):
+        parsedProxy = urlparse(upstreamProxy)
+        self.upstreamHost = parsedProxy.hostname
+        self.upstreamPort = parsedProxy.port or (
+            443 if parsedProxy.scheme == "https" else 80
+        )
+        self.upstreamTls = parsedProxy.scheme == "https"
+        username = unquote(parsedProxy.username or "")
+        password = unquote(parsedProxy.password or "")
+        self.authorizationHeader = b"Proxy-Authorization: Basic " + base64.b64encode(
+            f"{username}:{password}".encode()
+        )
+        self.loop = asyncio.new_event_loop()
+        self.server: asyncio.Server | None = None
+        self.thread: threading.Thread | None = None
+        self.writers: set[asyncio.StreamWriter] = set()
+        """
+        the open connections, closed with the forwarder
+        """
+
+    def start(self) -> str:
+        """
+        Starts listening on a free local port, in a background thread.
+
+        Returns:
+            the url of the local proxy, for `--proxy-server`
+        """
+        self.server = self.loop.run_until_complete(
+            asyncio.start_server(self.handle, "127.0.0.1", 0)
+        )
+        self.thread = threading.Thread(
+            target=self.loop.run_forever, name="proxy-forwarder", daemon=True
+        )
+        self.thread.start()
+        port = self.server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    def close(self) -> None:
+        if self.thread is None:
+            return
+
+        async def stop() -> None:
+            self.server.close()
+            for writer in self.writers:
+                writer.close()
+            handlers = asyncio.all_tasks() - {asyncio.current_task()}
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self.server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(stop(), self.loop).result(timeout=10)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=10)
+        self.loop.close()
+        self.thread = None
+
+    def addAuthorization(self, head: bytes) -> bytes:
+        """
+        Adds the upstream credentials to a request head. Plain HTTP requests get their
+        own connection, as only the first request of a connection is rewritten.
+        """
+        requestLine, *headers = head[: -len(HEAD_END)].split(b"\r\n")
+        isConnect = requestLine.upper().startswith(b"CONNECT ")
+        keptHeaders = [
+            header
+            for header in headers
+            if not header.lower().startswith(b"proxy-authorization:")
+            and (
+                isConnect
+                or not header.lower().startswith((b"connection:", b"proxy-connection:"))
+            )
+        ]
+        keptHeaders.append(self.authorizationHeader)
+        if not isConnect:
+            keptHeaders.append(b"Connection: close")
+        return b"\r\n".join([requestLine, *keptHeaders]) + HEAD_END
+
+    async def handle(
+        self, clientReader: asyncio.StreamReader, clientWriter: asyncio.StreamWriter
+    ) -> None:
+        upstreamWriter: asyncio.StreamWriter | None = None
+        self.writers.add(clientWriter)
+        try:
+            head = await clientReader.readuntil(HEAD_END)
+            upstreamReader, upstreamWriter = await asyncio.open_connection(
+                self.upstreamHost, self.upstreamPort, ssl=self.upstreamTls or None
+            )
+            self.writers.add(upstreamWriter)
+            upstreamWriter.write(self.addAuthorization(head))
+            await asyncio.gather(
+                self.pipe(clientReader, upstreamWriter),
+                self.pipe(upstreamReader, clientWriter),
+            )
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError) as e:
+            logging.debug(f"[PROXY] Forwarding failed: {e!r}")
+        finally:
+            for writer in (clientWriter, upstreamWriter):
+                if writer is not None:
+                    writer.close()
+                    self.writers.discard(writer)
+
+    @staticmethod
+    async def pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        with contextlib.suppress(OSError):
+            while data := await reader.read(64 * 1024):
+                writer.write(data)
+                await writer.drain()
+        with contextlib.suppress(OSError):
+            if writer.can_write_eof():
+                writer.write_eof()
@@ -1,12 +1,14 @@
 import logging
 import random
-import time
 import urllib.parse
 
 from selenium.webdriver.common.by import By
 
+from src.activities import getActivityId
 from src.browser import Browser
+from src.quizAnswers import QuizAnswers
 from .constants import REWARDS_URL
+from .utils import sleep
 
 
 class PunchCards:
@@ -20,14 +22,15 @@ class PunchCards:
 
     def completePunchCard(self, url: str, childPromotions: dict):
         # Function to complete a specific punch card
-        self.webdriver.get(url)
+        self.browser.utils.invalidateDashboardData()
+        self.browser.utils.goTo(url, "punchCard")
         for child in childPromotions:
             if child["complete"] is False:
                 if child["promotionType"] == "urlreward":
                     self.webdriver.find_element(
                         By.XPATH, "//a[@class='offer-cta']/div"
                     ).click()
-                    self.browser.utils.switchToNewTab(True)
+                    self.browser.utils.switchToNewTab(closeTab=True)
                 if child["promotionType"] == "quiz":
                     self.webdriver.find_element(
                         By.XPATH, "//a[@class='offer-cta']/div"
@@ -41,21 +44,28 @@ class PunchCards:
                     numberOfQuestions = max(
                         int(s) for s in counter.split() if s.isdigit()
                     )
-                    for question in range(numberOfQuestions):
-                        # Answer random quiz questions
-                        self.webdriver.find_element(
-                            By.XPATH,
-                            f'//*[@id="QuestionPane{question}"]/div[1]/div[2]'
-                            f'/a[{random.randint(1, 3)}]/div',
-                        ).click()
-                        time.sleep(random.randint(100, 700) / 100)
-                        self.webdriver.find_element(
-                            By.XPATH,
-                            f'//*[@id="AnswerPane{question}"]/div[1]/div[2]'
-                            f'/div[4]/a/div/span/input',
-                        ).click()
-                        time.sleep(random.randint(100, 700) / 100)
-                    time.sleep(random.randint(100, 700) / 100)
+                    quizId = getActivityId(child)
+                    with QuizAnswers(self.browser.localeGeo) as quizAnswers:
+                        for question in range(numberOfQuestions):
+                            choices = [
+                                f'//*[@id="QuestionPane{question}"]/div[1]/div[2]'
+                                f"/a[{choice}]/div"
+                                for choice in range(1, 4)
+                            ]
+                            self.browser.utils.answerQuizQuestion(
+                                quizAnswers,
+                                quizId,
+                                question,
+                                choices,
+                                (
+                                    By.XPATH,
+                                    f'//*[@id="AnswerPane{question}"]/div[1]/div[2]'
+                                    f"/div[4]/a/div/span/input",
+                                ),
+                                lambda: sleep(random.randint(100, 700) / 100),
+                            )
+                            sleep(random.randint(100, 700) / 100)
+                    sleep(random.randint(100, 700) / 100)
 
     def completePunchCards(self):
         # Function to complete all punch cards
@@ -101,9 +111,10 @@ class PunchCards:
                 )
             ):
                 # Click on promotional item and visit new tab
-                self.webdriver.find_element(
+                self.browser.utils.invalidateDashboardData()
+                self.browser.utils.waitUntilClickable(
                     By.XPATH, '//*[@id="promo-item"]/section/div/div/div/span'
                 ).click()
-                self.browser.utils.switchToNewTab(True)
+                self.browser.utils.switchToNewTab(closeTab=True)
         except Exception:
             logging.debug("", exc_info=True)
@@ -0,0 +1,100 @@
+import datetime
+import random
+import sqlite3
+from pathlib import Path
+
+from src.cache import getCacheDir
+
+
+class QuizAnswers:
+    """
+    The results of the choices made in today's quizzes, stored in SQLite so the
+    other accounts (and processes) of the same country, which get the same quizzes,
+    can answer directly once the correct choice is known, or at least not repeat a
+    wrong one.
+
+    Results are kept by day, country, quiz id, question index and choice index.
+    Those of previous days are deleted, as the daily quizzes change every day.
+    """
+
+    def __init__(self, country: str, path: Path | None = None):
+        self.country = country
+        if path is None:
+            getCacheDir().mkdir(parents=True, exist_ok=True)
+            path = getCacheDir() / "quiz_answers.sqlite3"
+        self.path = path
+        self.connection = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None
+        )
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS choices (
+                day TEXT NOT NULL,
+                country TEXT NOT NULL,
+                quizId TEXT NOT NULL,
+                question INTEGER NOT NULL,
+                choice INTEGER NOT NULL,
+                correct INTEGER NOT NULL,
+                PRIMARY KEY (day, country, quizId, question, choice)
+            )
+            """
+        )
+        self.deleteExpired()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    @staticmethod
+    def today() -> str:
+        return datetime.date.today().isoformat()
+
+    def deleteExpired(self) -> None:
+        self.connection.execute("DELETE FROM choices WHERE day < ?", (self.today(),))
+
+    def choose(
+        self, quizId: str, question: int, choiceCount: int
+    ) -> tuple[int, bool]:
+        """
+        Chooses the answer to the question among its `choiceCount` choices: the one
+        known to be correct, else a random one not known to be wrong.
+
+        Returns:
+            the index of the choice, and whether it's known to be correct
+        """
+        results = dict(
+            self.connection.execute(
+                "SELECT choice, correct FROM choices"
+                " WHERE day = ? AND country = ? AND quizId = ? AND question = ?",
+                (self.today(), self.country, quizId, question),
+            ).fetchall()
+        )
+        # Results of another quiz with the same id may not fit
+        results = {
+            choice: correct
+            for choice, correct in results.items()
+            if 0 <= choice < choiceCount
+        }
+        for choice, correct in results.items():
+            if correct:
+                return choice, True
+        remainingChoices = [
+            choice for choice in range(choiceCount) if choice not in results
+        ]
+        if len(remainingChoices) == 1:
+            return remainingChoices[0], True
+        return random.choice(remainingChoices or range(choiceCount)), False
+
+    def setResult(self, quizId: str, question: int, choice: int, correct: bool) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO choices"
+            " (day, country, quizId, question, choice, correct)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (self.today(), self.country, quizId, question, choice, correct),
+        )
@@ -10,7 +10,7 @@ from requests_oauthlib import OAuth2Session
 
 from src.browser import Browser
 from .activities import Activities
-from .utils import makeRequestsSession, cooldown
+from .utils import cooldown, sleep
 from selenium.webdriver.common.by import By
 
 # todo Use constant naming style
@@ -37,9 +37,10 @@ class ReadToEarn:
         logging.info("[READ TO EARN] " + "Trying to complete Read to Earn...")
 
         accountName = self.browser.email
-        mobileApp = makeRequestsSession(
-            OAuth2Session(client_id, scope=scope, redirect_uri=redirect_uri)
-        )
+        mobileApp = OAuth2Session(client_id, scope=scope, redirect_uri=redirect_uri)
+        # Reuse the browser session's pooled connections (and retries)
+        for prefix, adapter in self.browser.session.adapters.items():
+            mobileApp.mount(prefix, adapter)
         authorization_url = mobileApp.authorization_url(
             authorization_base_url, access_type="offline_access", login_hint=accountName
         )[0]
@@ -71,6 +72,7 @@ class ReadToEarn:
                 return
 
         logging.info("[READ TO EARN] Logged-in successfully !")
+        self.utils.invalidateDashboardData()
         token = mobileApp.fetch_token(
             token_url, authorization_response=redirect_response, include_client_id=True
         )
@@ -91,7 +93,7 @@ class ReadToEarn:
             json=json_data,
         )
         balance = r.json().get("response").get("balance")
-        time.sleep(random.randint(10, 20))
+        sleep(random.randint(10, 20))
 
         # json data to confirm an article is read
         json_data = {
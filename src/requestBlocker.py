@@ -0,0 +1,169 @@
+from collections import Counter
+
+from selenium.webdriver.chrome.webdriver import WebDriver
+
+from src.utils import CONFIG
+
+IMAGE_URLS = ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.ico*"]
+
+BLOCKED_URLS: dict[str, list[str]] = {
+    "common": [
+        # Fonts and media
+        "*.woff*",
+        "*.ttf*",
+        "*.otf*",
+        "*.mp4*",
+        "*.webm*",
+        "*.m3u8*",
+        "*.mp3*",
+        # Ads, analytics and telemetry
+        "*://*.doubleclick.net/*",
+        "*://*.googlesyndication.com/*",
+        "*://*.google-analytics.com/*",
+        "*://*.googletagmanager.com/*",
+        "*://*.clarity.ms/*",
+        "*://*.scorecardresearch.com/*",
+        "*://*.adnxs.com/*",
+        "*://*.taboola.com/*",
+        "*://*.outbrain.com/*",
+        "*://*.facebook.net/*",
+        "*://bat.bing.com/*",
+        "*://*.events.data.microsoft.com/*",
+        "*://js.monitor.azure.com/*",
+    ],
+    "rewards": IMAGE_URLS,
+    "search": IMAGE_URLS
+    + [
+        "*://*.bing.com/th?*",
+        "*://*.bing.com/th/id/*",
+        "*://*.bing.com/sa/simg/*",
+    ],
+    "quiz": IMAGE_URLS,
+}
+"""
+url patterns blocked on every page (`common`) and per kind of page, scripts and styles
+of Microsoft pages are kept as searches and quizzes rely on them
+"""
+
+TYPICAL_SIZES: dict[str, int] = {
+    "Image": 20 * 1024,
+    "Media": 500 * 1024,
+    "Font": 40 * 1024,
+    "Script": 30 * 1024,
+    "Stylesheet": 15 * 1024,
+    "XHR": 2 * 1024,
+    "Fetch": 2 * 1024,
+    "Ping": 0,
+    "Other": 5 * 1024,
+}
+"""
+rough transfer size of a request per resource type, to estimate the bytes saved by
+blocking requests of a type none of which was loaded
+"""
+
+
+class RequestBlocker:
+    """
+    Blocks the non-essential requests of a browser through CDP, with a blocklist per
+    kind of page, and counts what was blocked (with an estimate of the bytes saved)
+    and downloaded.
+    """
+
+    def __init__(self, webdriver: WebDriver):
+        self.webdriver = webdriver
+        self.enabled: bool = CONFIG.get("browser.block-requests.enabled")
+        self.profile: str | None = None
+        """
+        the kind of page requests are currently blocked for
+        """
+        self.blockedRequests: Counter[str] = Counter()
+        """
+        how many requests were blocked, per resource type
+        """
+        self.finishedRequests = 0
+        self.bytesReceived = 0
+        self.requestTypes: dict[str, str] = {}
+        """
+        the resource type of each request being loaded
+        """
+        self.finishedRequestsByType: Counter[str] = Counter()
+        self.bytesReceivedByType: Counter[str] = Counter()
+        if hasattr(webdriver, "add_cdp_listener"):
+            webdriver.add_cdp_listener(
+                "Network.responseReceived", self.onResponseReceived
+            )
+            webdriver.add_cdp_listener("Network.loadingFailed", self.onLoadingFailed)
+            webdriver.add_cdp_listener(
+                "Network.loadingFinished", self.onLoadingFinished
+            )
+
+    def getBlockedUrls(self, profile: str) -> list[str]:
+        """
+        Returns the default and configured url patterns to block for the kind of page.
+        """
+        return (
+            BLOCKED_URLS["common"]
+            + BLOCKED_URLS[profile]
+            + (CONFIG.get("browser.block-requests.common") or [])
+            + (CONFIG.get(f"browser.block-requests.{profile}") or [])
+        )
+
+    def use(self, profile: str) -> None:
+        """
+        Applies the blocklist of the kind of page about to be loaded (`rewards`,
+        `search` or `quiz`) to the current tab.
+        """
+        if not self.enabled:
+            return
+        self.profile = profile
+        self.webdriver.execute_cdp_cmd(
+            "Network.setBlockedURLs", {"urls": self.getBlockedUrls(profile)}
+        )
+
+    def onLoadingFailed(self, message: dict) -> None:
+        params = message["params"]
+        if params.get("blockedReason") == "inspector":
+            self.blockedRequests[params.get("type", "Other")] += 1
+
+    def onResponseReceived(self, message: dict) -> None:
+        params = message["params"]
+        self.requestTypes[params["requestId"]] = params.get("type", "Other")
+
+    def onLoadingFinished(self, message: dict) -> None:
+        params = message["params"]
+        receivedBytes = int(params.get("encodedDataLength", 0))
+        self.finishedRequests += 1
+        self.bytesReceived += receivedBytes
+        resourceType = self.requestTypes.pop(params.get("requestId"), "Other")
+        self.finishedRequestsByType[resourceType] += 1
+        self.bytesReceivedByType[resourceType] += receivedBytes
+
+    def estimateBytesSaved(self) -> int:
+        """
+        Estimates the bytes the blocked requests would have loaded, from the average
+        size of the loaded requests of the same type, else from `TYPICAL_SIZES`.
+        """
+        bytesSaved = 0.0
+        for resourceType, count in self.blockedRequests.items():
+            if self.finishedRequestsByType[resourceType]:
+                averageSize = (
+                    self.bytesReceivedByType[resourceType]
+                    / self.finishedRequestsByType[resourceType]
+                )
+            else:
+                averageSize = TYPICAL_SIZES.get(resourceType, TYPICAL_SIZES["Other"])
+            bytesSaved += count * averageSize
+        return round(bytesSaved)
+
+    def report(self) -> str:
+        blockedTypes = ", ".join(
+            f"{count} {resourceType.lower()}"
+            for resourceType, count in self.blockedRequests.most_common()
+        )
+        return (
+            f"blocked {self.blockedRequests.total()} requests"
+            + (f" ({blockedTypes})" if blockedTypes else "")
+            + f", saving about {self.estimateBytesSaved() / 1024 / 1024:.1f} MB"
+            + f", loaded {self.finishedRequests} requests"
+            f" ({self.bytesReceived / 1024 / 1024:.1f} MB)"
+        )
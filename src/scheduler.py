@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from src.utils import Config, setWaitHook
+
+
+class CooperativeScheduler:
+    """
+    Drives several accounts from a single process with an asyncio event loop.
+
+    Each account runs its blocking WebDriver code in its own thread, but only `active`
+    accounts may hold a slot, i.e. drive their browser, at the same time. Every wait
+    going through `src.utils.sleep` (cooldowns, search pauses, retry backoffs...) gives
+    the slot back and becomes an `asyncio.sleep` on the loop, so whichever account is
+    ready next can run meanwhile.
+    """
+
+    def __init__(self, workers: int, active: int = 1):
+        self.workers = workers
+        """
+        the max amount of accounts started (and browsers opened) at the same time
+        """
+        self.active = max(1, min(active, workers))
+        """
+        the max amount of accounts driving their browser at the same time
+        """
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.slots: asyncio.Semaphore | None = None
+
+    def run(
+        self, accounts: list[Config], target: Callable[[Config], Any]
+    ) -> list[tuple[Config, Any, BaseException | None]]:
+        """
+        Runs `target` for every account.
+
+        Returns:
+            (account, result or None, error or None), in completion order
+        """
+        return asyncio.run(self.runAll(accounts, target))
+
+    async def runAll(
+        self, accounts: list[Config], target: Callable[[Config], Any]
+    ) -> list[tuple[Config, Any, BaseException | None]]:
+        self.loop = asyncio.get_running_loop()
+        self.slots = asyncio.Semaphore(self.active)
+        started = asyncio.Semaphore(self.workers)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            tasks = [
+                self.runAccount(account, target, executor, started)
+                for account in accounts
+            ]
+            return [await task for task in asyncio.as_completed(tasks)]
+
+    async def runAccount(
+        self,
+        account: Config,
+        target: Callable[[Config], Any],
+        executor: ThreadPoolExecutor,
+        started: asyncio.Semaphore,
+    ) -> tuple[Config, Any, BaseException | None]:
+        async with started:
+            await self.slots.acquire()
+            try:
+                result = await self.loop.run_in_executor(
+                    executor, self.runInThread, account, target
+                )
+            except Exception as e:
+                return account, None, e
+            finally:
+                self.slots.release()
+        return account, result, None
+
+    def runInThread(self, account: Config, target: Callable[[Config], Any]) -> Any:
+        threading.current_thread().name = account.email
+        setWaitHook(self.wait)
+        try:
+            return target(account)
+        finally:
+            setWaitHook(None)
+
+    def wait(self, seconds: float) -> None:
+        """
+        Called from an account thread, blocks it until `seconds` elapsed on the loop
+        and a slot is free again.
+        """
+        asyncio.run_coroutine_threadsafe(self.yieldSlot(seconds), self.loop).result()
+
+    async def yieldSlot(self, seconds: float) -> None:
+        self.slots.release()
+        logging.debug(f"[SCHEDULER] Yielding for {seconds} seconds")
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            await self.slots.acquire()
@@ -1,16 +1,23 @@
-import dbm.dumb
+import contextlib
 import logging
-import shelve
+import time
 from enum import Enum, auto
 from random import random, randint
-from time import sleep
 from typing import Final
 
+from selenium.common import TimeoutException
 from selenium.webdriver.common.by import By
-from trendspy import Trends
 
 from src.browser import Browser
-from src.utils import CONFIG, getProjectRoot, cooldown, COUNTRY
+from src.keywordQueue import KeywordQueue
+from src.trendsPool import waitForKeywords
+from src.utils import CONFIG, cooldown, sleep
+
+CREDIT_TIMEOUT = 20
+"""
+how many seconds to wait for a search to be credited before retrying it
+"""
+CREDIT_POLL_INTERVAL = 4
 
 
 class RetriesStrategy(Enum):
@@ -33,29 +40,31 @@ class Searches:
     Class to handle searches in MS Rewards.
     """
 
-    maxRetries: Final[int] = CONFIG.retries.max
-    """
-    the max amount of retries to attempt
-    """
-    baseDelay: Final[float] = CONFIG.get("retries.backoff-factor")
-    """
-    how many seconds to delay
-    """
-    # retriesStrategy = Final[  # todo Figure why doesn't work with equality below
-    retriesStrategy = RetriesStrategy[CONFIG.retries.strategy]
-
     def __init__(self, browser: Browser):
         self.browser = browser
         self.webdriver = browser.webdriver
 
-        dumbDbm = dbm.dumb.open((getProjectRoot() / "google_trends").__str__())
-        self.googleTrendsShelf: shelve.Shelf = shelve.Shelf(dumbDbm)
+        self.maxRetries: Final[int] = CONFIG.retries.max
+        """
+        the max amount of retries to attempt
+        """
+        self.baseDelay: Final[float] = CONFIG.get("retries.backoff-factor")
+        """
+        how many seconds to delay
+        """
+        self.retriesStrategy = RetriesStrategy[CONFIG.retries.strategy]
+        self.verifyEvery: int = max(1, CONFIG.get("search.verify-every") or 1)
+        """
+        after how many searches to check they were credited, 1 to check each one
+        """
+
+        self.keywordQueue = KeywordQueue()
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.googleTrendsShelf.__exit__(None, None, None)
+        self.keywordQueue.close()
 
     def bingSearches(self) -> None:
         # Function to perform Bing searches
@@ -65,41 +74,117 @@ class Searches:
 
         self.browser.utils.goToSearch()
 
+        previousRemaining: int | None = None
+        stalledBatches = 0
         while True:
             desktopAndMobileRemaining = self.browser.getRemainingSearches(
                 desktopAndMobile=True
             )
             logging.info(f"[BING] Remaining searches={desktopAndMobileRemaining}")
-            if (
-                self.browser.browserType == "desktop"
-                and desktopAndMobileRemaining.desktop == 0
-            ) or (
-                self.browser.browserType == "mobile"
-                and desktopAndMobileRemaining.mobile == 0
-            ):
+            remaining = (
+                desktopAndMobileRemaining.desktop
+                if self.browser.browserType == "desktop"
+                else desktopAndMobileRemaining.mobile
+            )
+            if remaining == 0:
                 break
 
-            if desktopAndMobileRemaining.getTotal() > len(self.googleTrendsShelf):
-                logging.debug(
-                    f"google_trends before load = {list(self.googleTrendsShelf.items())}"
-                )
-                trends = Trends()
-                trends = trends.trending_now(geo=COUNTRY)[
-                    : desktopAndMobileRemaining.getTotal()
-                ]
-                for trend in trends:
-                    self.googleTrendsShelf[trend.keyword] = trend
-                logging.debug(
-                    f"google_trends after load = {list(self.googleTrendsShelf.items())}"
-                )
+            if self.verifyEvery > 1 and previousRemaining is not None:
+                # Batched verification, retry only once credit stalls for a whole batch
+                if remaining < previousRemaining:
+                    stalledBatches = 0
+                else:
+                    stalledBatches += 1
+                    if stalledBatches > self.maxRetries:
+                        logging.error("[BING] Reached max search attempt retries")
+                        break
+                    sleepTime = self.getRetryDelay(stalledBatches)
+                    logging.debug(
+                        f"[BING] Search batch not counted {stalledBatches}/{self.maxRetries},"
+                        f" sleeping {sleepTime} seconds..."
+                    )
+                    sleep(sleepTime)
+            previousRemaining = remaining
+
+            # Usually already prefetched for all the accounts at startup
+            waitForKeywords(
+                self.keywordQueue,
+                self.browser.localeGeo,
+                self.browser.localeLang,
+                desktopAndMobileRemaining.getTotal(),
+            )
 
-            self.bingSearch()
+            if self.verifyEvery > 1:
+                self.bingSearchBatch(min(remaining, self.verifyEvery))
+            else:
+                self.bingSearch()
             sleep(randint(10, 15))
 
         logging.info(
             f"[BING] Finished {self.browser.browserType.capitalize()} Edge Bing searches !"
         )
 
+    def bingSearchBatch(self, searches: int) -> None:
+        """
+        Performs several Bing searches without checking whether each one was credited,
+        that's checked once for the whole batch by `bingSearches`.
+        """
+        for i in range(searches):
+            if i != 0:
+                cooldown()
+                sleep(randint(10, 15))
+            keyword = self.keywordQueue.pop(self.browser.localeGeo)
+            if keyword is None:
+                logging.error("[BING] No search keyword left")
+                return
+            self.submitSearch(keyword)
+        cooldown()
+
+    def getRetryDelay(self, attempt: int) -> float:
+        """
+        Returns how many seconds to wait before the given retry attempt (from 1).
+        """
+        sleepTime: float
+        if self.retriesStrategy == RetriesStrategy.EXPONENTIAL:
+            sleepTime = self.baseDelay * 2 ** (attempt - 1)
+        elif self.retriesStrategy == RetriesStrategy.CONSTANT:
+            sleepTime = self.baseDelay
+        else:
+            raise AssertionError
+        sleepTime += self.baseDelay * random()  # Add jitter
+        return sleepTime
+
+    def submitSearch(self, keyword: str) -> None:
+        self.browser.utils.goToSearch()
+        searchbar = self.browser.utils.waitUntilClickable(
+            By.ID, "sb_form_q", timeToWait=40
+        )
+        searchbar.clear()
+        logging.debug(f"trendKeyword={keyword}")
+        sleep(10)
+        searchbar.send_keys(keyword)
+        sleep(10)
+        searchbar.submit()
+        self.browser.utils.invalidateDashboardData()
+        with contextlib.suppress(TimeoutException):
+            self.browser.utils.waitUntilReady("searchResults")
+
+    def waitForCredit(self, pointsBefore: int) -> int:
+        """
+        Reads the account points until they're above `pointsBefore`, as a search is
+        credited a few seconds after its results, for `CREDIT_TIMEOUT` seconds at most.
+
+        Returns:
+            the last account points read
+        """
+        deadline = time.monotonic() + CREDIT_TIMEOUT
+        while True:
+            self.browser.utils.invalidateDashboardData()
+            points = self.browser.utils.getAccountPoints()
+            if points > pointsBefore or time.monotonic() >= deadline:
+                return points
+            sleep(CREDIT_POLL_INTERVAL)
+
     def bingSearch(self) -> None:
         # Function to perform a single Bing search
         try:
@@ -109,55 +194,30 @@ class Searches:
             cooldown()
             return
 
-        trend = list(self.googleTrendsShelf.keys())[0]
-        trendKeywords = self.googleTrendsShelf[trend].trend_keywords
-        logging.debug(f"trendKeywords={trendKeywords}")
-        logging.debug(f"trend={trend}")
-        baseDelay = Searches.baseDelay
-
         for i in range(self.maxRetries + 1):
-            if i != 0:
-                if not trendKeywords:
-                    del self.googleTrendsShelf[trend]
-
-                    trend = list(self.googleTrendsShelf.keys())[0]
-                    trendKeywords = self.googleTrendsShelf[trend].trend_keywords
+            keyword = self.keywordQueue.pop(self.browser.localeGeo)
+            if keyword is None:
+                logging.error("[BING] No search keyword left")
+                return
 
-                sleepTime: float
-                if Searches.retriesStrategy == Searches.retriesStrategy.EXPONENTIAL:
-                    sleepTime = baseDelay * 2 ** (i - 1)
-                elif Searches.retriesStrategy == Searches.retriesStrategy.CONSTANT:
-                    sleepTime = baseDelay
-                else:
-                    raise AssertionError
-                sleepTime += baseDelay * random()  # Add jitter
+            if i != 0:
+                sleepTime = self.getRetryDelay(i)
                 logging.debug(
-                    f"[BING] Search attempt not counted {i}/{Searches.maxRetries},"
+                    f"[BING] Search attempt not counted {i}/{self.maxRetries},"
                     f" sleeping {sleepTime}"
                     f" seconds..."
                 )
                 sleep(sleepTime)
 
-            self.browser.utils.goToSearch()
-            searchbar = self.browser.utils.waitUntilClickable(
-                By.ID, "sb_form_q", timeToWait=40
-            )
-            searchbar.clear()
-            trendKeyword = trendKeywords.pop()
-            logging.debug(f"trendKeyword={trendKeyword}")
-            sleep(10)
-            searchbar.send_keys(trendKeyword)
-            sleep(10)
-            searchbar.submit()
+            self.submitSearch(keyword)
 
             try:
-                pointsAfter = self.browser.utils.getAccountPoints()
+                pointsAfter = self.waitForCredit(pointsBefore)
             except:
                 logging.error("[BING] Error Getting AccountPoints After Search - Assume Search Successfull")
                 pointsAfter = pointsBefore + 3
                 
             if pointsBefore < pointsAfter:
-                del self.googleTrendsShelf[trend]
                 cooldown()
                 return
 
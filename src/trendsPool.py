@@ -0,0 +1,101 @@
+import logging
+import threading
+import time
+from itertools import zip_longest
+from typing import Iterator
+
+from trendspy import Trends
+
+from src.keywordGenerator import KeywordGenerator
+from src.keywordQueue import KeywordQueue
+from src.utils import Config, CONFIG, getLanguageCountry, sleep
+
+TRENDS_REFRESH = 60 * 60
+"""
+how many seconds to wait before fetching the trends of a country again
+"""
+TRENDS_FETCH_TIMEOUT = 2 * 60
+"""
+how many seconds a trends fetch may take before another one is started
+"""
+
+
+def getTrendKeywords(trends: list) -> Iterator[str]:
+    """
+    Yields the related keywords of each trend (or the trend itself), the last ones
+    first, interleaved so consecutive searches are about different trends.
+    """
+    keywordsPerTrend = [
+        reversed(trend.trend_keywords) if trend.trend_keywords else [trend.keyword]
+        for trend in trends
+    ]
+    for keywords in zip_longest(*keywordsPerTrend):
+        yield from (keyword for keyword in keywords if keyword)
+
+
+def fetchTrends(queue: KeywordQueue, country: str) -> None:
+    """
+    Queues the trending keywords of the country, unless they were fetched recently or
+    are being fetched, by another account or process too.
+    """
+    if not queue.claimFetch(country, TRENDS_REFRESH, TRENDS_FETCH_TIMEOUT):
+        return
+    try:
+        trends = Trends().trending_now(geo=country)
+    except BaseException:
+        queue.finishFetch(country, succeeded=False)
+        raise
+    queued = queue.add(country, getTrendKeywords(trends))
+    queue.finishFetch(country, succeeded=True)
+    logging.debug(f"[TRENDS] Queued {queued} new keywords for {country}")
+
+
+def prefetchTrends(accounts: list[Config]) -> threading.Thread:
+    """
+    Starts fetching the trends of the countries of all the accounts in a background
+    thread, so it overlaps with the browsers starting and searches don't wait for it.
+    """
+    countries = {
+        getLanguageCountry(CONFIG.browser.proxy or account.get("proxy"))[1]
+        for account in accounts
+    }
+
+    def prefetch() -> None:
+        with KeywordQueue() as queue:
+            for country in countries:
+                try:
+                    fetchTrends(queue, country)
+                except Exception:
+                    logging.warning(
+                        f"[TRENDS] Couldn't prefetch {country} trends", exc_info=True
+                    )
+
+    thread = threading.Thread(target=prefetch, name="trends-prefetch", daemon=True)
+    thread.start()
+    return thread
+
+
+def waitForKeywords(
+    queue: KeywordQueue, country: str, language: str, needed: int
+) -> None:
+    """
+    Makes sure `needed` keywords are queued for the country, waiting for a trends
+    fetch in progress, else fetching them now, and generating the missing ones
+    offline if trends fail or run out.
+    """
+    deadline = time.monotonic() + TRENDS_FETCH_TIMEOUT
+    while (
+        queue.count(country) < needed
+        and queue.isFetching(country, TRENDS_FETCH_TIMEOUT)
+        and time.monotonic() < deadline
+    ):
+        sleep(1)
+    if queue.count(country) < needed:
+        try:
+            fetchTrends(queue, country)
+        except Exception:
+            logging.warning(f"[TRENDS] Couldn't fetch {country} trends", exc_info=True)
+    missing = needed - queue.count(country)
+    if missing > 0:
+        queued = queue.add(country, KeywordGenerator(language).generate(missing))
+        logging.info(f"[TRENDS] Generated {queued} keywords offline for {country}")
@@ -1,9 +1,11 @@
+import logging
 import random
-from typing import Any
+from typing import Any, Callable
 
 import requests
-from requests import HTTPError, Response
+from requests import HTTPError, Response, Session
 
+from src.cache import JsonCache
 from src.utils import makeRequestsSession
 
 
@@ -32,6 +34,11 @@ class GenerateUserAgent:
     OS_PLATFORMS = {"win": "Windows NT 10.0", "android": "Linux"}
     OS_CPUS = {"win": "Win64; x64", "android": "Android 13"}
 
+    VERSIONS_CACHE = JsonCache("user_agent_versions", ttl=12 * 60 * 60)
+
+    def __init__(self, session: Session | None = None):
+        self.session = session if session is not None else makeRequestsSession()
+
     def userAgent(
         self,
         browserConfig: dict[str, Any] | None,
@@ -139,9 +146,6 @@ class GenerateUserAgent:
         Returns:
             str: The latest version of Microsoft Edge.
         """
-        response = self.getWebdriverPage(
-            "https://edgeupdates.microsoft.com/api/products"
-        )
 
         def getValueIgnoreCase(data: dict, key: str) -> Any:
             """Get the value from a dictionary ignoring the case of the first letter of the key."""
@@ -150,39 +154,44 @@ class GenerateUserAgent:
                     return v
             return None
 
-        data = response.json()
-        if stableProduct := next(
-            (
-                product
-                for product in data
-                if getValueIgnoreCase(product, "product") == "Stable"
-            ),
-            None,
-        ):
-            releases = getValueIgnoreCase(stableProduct, "releases")
-            androidRelease = next(
-                (
-                    release
-                    for release in releases
-                    if getValueIgnoreCase(release, "platform") == "Android"
-                ),
-                None,
-            )
-            windowsRelease = next(
+        def parseEdgeVersions(data: list) -> list[str]:
+            if stableProduct := next(
                 (
-                    release
-                    for release in releases
-                    if getValueIgnoreCase(release, "platform") == "Windows"
-                    and getValueIgnoreCase(release, "architecture") == "x64"
+                    product
+                    for product in data
+                    if getValueIgnoreCase(product, "product") == "Stable"
                 ),
                 None,
-            )
-            if androidRelease and windowsRelease:
-                return (
-                    getValueIgnoreCase(windowsRelease, "productVersion"),
-                    getValueIgnoreCase(androidRelease, "productVersion"),
+            ):
+                releases = getValueIgnoreCase(stableProduct, "releases")
+                androidRelease = next(
+                    (
+                        release
+                        for release in releases
+                        if getValueIgnoreCase(release, "platform") == "Android"
+                    ),
+                    None,
                 )
-        raise HTTPError("Failed to get Edge versions.")
+                windowsRelease = next(
+                    (
+                        release
+                        for release in releases
+                        if getValueIgnoreCase(release, "platform") == "Windows"
+                        and getValueIgnoreCase(release, "architecture") == "x64"
+                    ),
+                    None,
+                )
+                if androidRelease and windowsRelease:
+                    return [
+                        getValueIgnoreCase(windowsRelease, "productVersion"),
+                        getValueIgnoreCase(androidRelease, "productVersion"),
+                    ]
+            raise HTTPError("Failed to get Edge versions.")
+
+        windowsVersion, androidVersion = self.getCachedVersion(
+            "https://edgeupdates.microsoft.com/api/products", parseEdgeVersions
+        )
+        return windowsVersion, androidVersion
 
     def getChromeVersion(self) -> str:
         """
@@ -191,16 +200,70 @@ class GenerateUserAgent:
         Returns:
             str: The latest version of Google Chrome.
         """
-        response = self.getWebdriverPage(
-            "https://googlechromelabs.github.io/chrome-for-testing/last-known-good-versions.json"
+        return self.getCachedVersion(
+            "https://googlechromelabs.github.io/chrome-for-testing/last-known-good-versions.json",
+            lambda data: data["channels"]["Stable"]["version"],
         )
-        data = response.json()
-        return data["channels"]["Stable"]["version"]
 
-    @staticmethod
-    def getWebdriverPage(url: str) -> Response:
-        response = makeRequestsSession().get(url)
-        if response.status_code != requests.codes.ok:  # pylint: disable=no-member
+    def getCachedVersion(self, url: str, parse: Callable[[Any], Any]) -> Any:
+        """
+        Gets the version(s) parsed from the JSON at the given url, shared by all
+        browsers and runs through `VERSIONS_CACHE`.
+
+        Once expired, the cached version is revalidated using the ETag/Last-Modified
+        headers of the previous response, and still used if the request fails.
+        """
+        cachedEntry = self.VERSIONS_CACHE.getEntry(url)
+        if cachedEntry and self.VERSIONS_CACHE.isFresh(cachedEntry):
+            return cachedEntry["value"]
+
+        headers = {}
+        if cachedEntry and cachedEntry.get("etag"):
+            headers["If-None-Match"] = cachedEntry["etag"]
+        if cachedEntry and cachedEntry.get("lastModified"):
+            headers["If-Modified-Since"] = cachedEntry["lastModified"]
+        try:
+            response = self.getWebdriverPage(url, headers)
+            if (
+                cachedEntry
+                and response.status_code
+                == requests.codes.not_modified  # pylint: disable=no-member
+            ):
+                version = cachedEntry["value"]
+            else:
+                version = parse(response.json())
+        except (requests.RequestException, ValueError, KeyError):
+            if cachedEntry is None:
+                raise
+            logging.warning(
+                f"[USER AGENT] Failed to get {url}, using last known version",
+                exc_info=True,
+            )
+            return cachedEntry["value"]
+
+        validators = {
+            "etag": response.headers.get("ETag"),
+            "lastModified": response.headers.get("Last-Modified"),
+        }
+        if (
+            response.status_code
+            == requests.codes.not_modified  # pylint: disable=no-member
+        ):
+            # A 304 response may not send the validators again
+            validators = {
+                key: value or cachedEntry.get(key) for key, value in validators.items()
+            }
+        self.VERSIONS_CACHE.set(url, version, **validators)
+        return version
+
+    def getWebdriverPage(
+        self, url: str, headers: dict[str, str] | None = None
+    ) -> Response:
+        response = self.session.get(url, headers=headers)
+        if response.status_code not in (
+            requests.codes.ok,  # pylint: disable=no-member
+            requests.codes.not_modified,  # pylint: disable=no-member
+        ):
             raise HTTPError(
                 f"Failed to get webdriver page {url}. "
                 f"Status code: {response.status_code}"
@@ -1,4 +1,6 @@
 import contextlib
+import functools
+import hashlib
 import importlib
 import json
 import locale as pylocale
@@ -7,21 +9,19 @@ import random
 import re
 import shutil
 import sys
+import threading
 import time
 from argparse import Namespace, ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from datetime import date
 from pathlib import Path
 from types import ModuleType
-from typing import Any, Self
+from typing import TYPE_CHECKING, Any, Callable, Self
 
-import psutil
 import pycountry
 import requests
 import yaml
-from apprise import Apprise
-from ipapi import ipapi
-from ipapi.exceptions import RateLimited
 from requests import Session, JSONDecodeError
 from requests.adapters import HTTPAdapter
 from selenium.common import (
@@ -39,7 +39,18 @@ from urllib3 import Retry
 
 from .constants import REWARDS_URL, SEARCH_URL
 
+if TYPE_CHECKING:
+    from apprise import Apprise
+
+    from .quizAnswers import QuizAnswers
+    from .requestBlocker import RequestBlocker
+
 PREFER_BING_INFO = False
+PREFER_HTTP_DASHBOARD = True
+"""
+fetch the dashboard data over HTTP with the browser cookies, rather than rendering
+the rewards page, falling back to the browser if it fails
+"""
 
 
 class Config(dict):
@@ -188,6 +199,22 @@ DEFAULT_CONFIG: Config = Config(
             "language": None,
             "visible": False,
             "proxy": None,
+            "selenium-wire": False,
+            "page-load-strategy": "eager",
+            "capture": {
+                "scopes": [
+                    r"https://rewards\.bing\.com/.*",
+                    r"https://www\.bing\.com/rewards/.*",
+                ],
+                "max-entries": 100,
+            },
+            "block-requests": {
+                "enabled": True,
+                "common": [],
+                "rewards": [],
+                "search": [],
+                "quiz": [],
+            },
         },
         "rtfr": False,
         "logging": {
@@ -196,19 +223,133 @@ DEFAULT_CONFIG: Config = Config(
         },
         "retries": {"backoff-factor": 120, "max": 4, "strategy": "EXPONENTIAL"},
         "cooldown": {"min": 300, "max": 600},
-        "search": {"type": "both"},
+        "search": {"type": "both", "verify-every": 1},
+        "parallel": {
+            "workers": 1,
+            "mode": "PROCESS",
+            "active": 1,
+            "concurrent-phases": False,
+            "activity-tabs": 1,
+        },
         "accounts": [],
     }
 )
 
 
+DOCUMENT_PARSED_SCRIPT = "return document.readyState !== 'loading'"
+DOCUMENT_ORIGIN_SCRIPT = "return performance.timeOrigin"
+PAGE_READINESS: dict[str, Callable[[WebDriver], Any]] = {
+    # The dashboard object and the cards only come after the document is parsed
+    "rewards": lambda driver: driver.execute_script(
+        "return document.readyState !== 'loading'"
+        " && typeof dashboard !== 'undefined' && !!dashboard && !!dashboard.userStatus"
+        " && document.querySelector('mee-card, [data-bi-id]') !== null"
+    ),
+    "search": expected_conditions.element_to_be_clickable((By.ID, "sb_form_q")),
+    "searchResults": expected_conditions.presence_of_element_located(
+        (By.ID, "b_results")
+    ),
+    # A new tab is first on a complete "about:blank" document
+    "activity": lambda driver: (
+        driver.current_url != "about:blank"
+        and driver.execute_script(DOCUMENT_PARSED_SCRIPT)
+    ),
+    "punchCard": lambda driver: driver.execute_script(
+        "return document.readyState === 'complete'"
+        " || (document.readyState === 'interactive'"
+        " && document.querySelector('a.offer-cta') !== null)"
+    ),
+}
+"""
+when each kind of page is ready to be used, as pages may still be loading when
+`webdriver.get` returns with the `eager` or `none` page load strategies
+"""
+PAGE_READY_TIMEOUT = 30
+TAB_POLL_FREQUENCY = 0.1
+"""
+how often to check whether a new tab was opened, chromedriver doesn't report
+target events through the performance log undetected_chromedriver listens to
+"""
+ANSWER_RESULT_SCRIPT = """
+const choice = document.evaluate(
+  arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+).singleNodeValue;
+if (choice === null) return null;
+const classes = [...choice.classList];
+const wrong = classes.some((name) => /incorrect|wrong/i.test(name));
+const correct = classes.some(
+  (name) => /correct/i.test(name) && !/incorrect/i.test(name)
+);
+return wrong === correct ? null : correct;
+"""
+"""
+returns whether the chosen quiz answer (given by XPath) was correct, from its own
+classes once answered, or null if they don't tell unambiguously
+"""
+
+DASHBOARD_READY_SCRIPT = (
+    "return typeof dashboard !== 'undefined' && dashboard && dashboard.userStatus"
+    " ? dashboard : null"
+)
+"""
+returns the rewards page `dashboard` object once populated, else null
+"""
+DASHBOARD_TIMEOUT = 30
+"""
+how many seconds to wait for the dashboard data after loading the rewards page
+"""
+
+
+class DashboardDataError(Exception):
+    """
+    Raised when the rewards page doesn't provide the dashboard data in time.
+    """
+
+
+def parseDashboardData(html: str) -> dict | None:
+    """
+    Extracts the `dashboard` object declared in an inline script of the rewards page.
+
+    Returns:
+        the dashboard data, or None if not found
+    """
+    match = re.search(r"var\s+dashboard\s*=\s*", html)
+    if match is None:
+        return None
+    try:
+        dashboard, _ = json.JSONDecoder().raw_decode(html, match.end())
+    except ValueError:
+        return None
+    if not isinstance(dashboard, dict) or "userStatus" not in dashboard:
+        return None
+    return dashboard
+
+
 class Utils:
     """
     A class that provides utility functions for Selenium WebDriver interactions.
     """
 
-    def __init__(self, webdriver: WebDriver):
+    def __init__(
+        self,
+        webdriver: WebDriver,
+        session: Session | None = None,
+        requestBlocker: "RequestBlocker | None" = None,
+    ):
+        from .browserSession import BrowserSession
+
         self.webdriver = webdriver
+        self.session: Session = (
+            session if session is not None else BrowserSession(webdriver)
+        )
+        """
+        the browser's requests session, sharing its cookies
+        """
+        self.dashboardData: dict | None = None
+        """
+        the last dashboard snapshot, until `invalidateDashboardData` is called
+        """
+        self.requestBlocker = requestBlocker
         with contextlib.suppress(Exception):
             locale = pylocale.getlocale()[0]
             pylocale.setlocale(pylocale.LC_NUMERIC, locale)
@@ -228,7 +369,7 @@ class Utils:
         )
 
     def checkIfTextPresentAfterDelay(self, text: str, timeToWait: float = 10) -> bool:
-        time.sleep(timeToWait)
+        sleep(timeToWait)
         text_found = re.search(text, self.webdriver.page_source)
         return text_found is not None
 
@@ -239,33 +380,118 @@ class Utils:
         return self.waitUntilVisible(By.XPATH, '//*[@id="rqStartQuiz"]')
 
     def resetTabs(self) -> None:
-        curr = self.webdriver.current_window_handle
+        """
+        Closes every tab but the first one, and goes back to the rewards page in it
+        unless it's still there.
+        """
+        handles = self.webdriver.window_handles
+        for handle in handles[1:]:
+            self.webdriver.switch_to.window(handle)
+            self.webdriver.close()
+        self.webdriver.switch_to.window(handles[0])
+        if self.webdriver.current_url != REWARDS_URL:
+            self.goToRewards()
+
+    def blockRequests(self, profile: str) -> None:
+        """
+        Blocks the non-essential requests of the kind of page about to be loaded.
+        """
+        if self.requestBlocker is not None:
+            self.requestBlocker.use(profile)
 
-        for handle in self.webdriver.window_handles:
-            if handle != curr:
-                self.webdriver.switch_to.window(handle)
-                time.sleep(0.5)
-                self.webdriver.close()
-                time.sleep(0.5)
+    def goTo(self, url: str, page: str) -> None:
+        """
+        Loads the url and waits until it's ready to be used as the given kind of page
+        (a `PAGE_READINESS` key), whatever the page load strategy.
+        """
+        previousDocument = self.webdriver.execute_script(DOCUMENT_ORIGIN_SCRIPT)
+        self.webdriver.get(url)
+        self.waitUntilReady(
+            page,
+            # With the `none` strategy, the previous page may still be there
+            lambda driver: driver.execute_script(DOCUMENT_ORIGIN_SCRIPT)
+            != previousDocument,
+        )
 
-        self.webdriver.switch_to.window(curr)
-        time.sleep(0.5)
-        self.goToRewards()
+    def waitUntilReady(
+        self, page: str, precondition: Callable[[WebDriver], Any] | None = None
+    ) -> None:
+        WebDriverWait(self.webdriver, PAGE_READY_TIMEOUT).until(
+            lambda driver: (precondition is None or precondition(driver))
+            and PAGE_READINESS[page](driver)
+        )
 
     def goToRewards(self) -> None:
-        self.webdriver.get(REWARDS_URL)
+        self.blockRequests("rewards")
+        self.goTo(REWARDS_URL, "rewards")
         assert (
             self.webdriver.current_url == REWARDS_URL
         ), f"{self.webdriver.current_url} {REWARDS_URL}"
 
     def goToSearch(self) -> None:
-        self.webdriver.get(SEARCH_URL)
+        self.blockRequests("search")
+        self.goTo(SEARCH_URL, "search")
 
     # Prefer getBingInfo if possible
-    def getDashboardData(self) -> dict:
-        self.goToRewards()
-        time.sleep(5)  # fixme Avoid busy wait (if this works)
-        return self.webdriver.execute_script("return dashboard")
+    def getDashboardData(self, refresh: bool = False) -> dict:
+        """
+        Returns the rewards dashboard data. The same snapshot is returned until
+        `invalidateDashboardData` is called (or `refresh` is set), so the rewards page
+        isn't loaded again for every read.
+        Doesn't navigate to the rewards page when returning the snapshot.
+        """
+        if self.dashboardData is None or refresh:
+            if PREFER_HTTP_DASHBOARD:
+                self.dashboardData = self.fetchDashboardData()
+                if self.dashboardData is not None:
+                    return self.dashboardData
+            try:
+                # Also waits for the dashboard data, with the page readiness
+                self.goToRewards()
+                self.dashboardData = WebDriverWait(
+                    self.webdriver, DASHBOARD_TIMEOUT
+                ).until(lambda driver: driver.execute_script(DASHBOARD_READY_SCRIPT))
+            except TimeoutException as e:
+                raise DashboardDataError(
+                    f"Dashboard data not available on {self.webdriver.current_url}"
+                    f" after {DASHBOARD_TIMEOUT} seconds"
+                ) from e
+        return self.dashboardData
+
+    def fetchDashboardData(self) -> dict | None:
+        """
+        Fetches the rewards page over HTTP with the browser cookies and parses its
+        dashboard data, without rendering anything.
+
+        Returns:
+            the dashboard data, or None if it couldn't be fetched
+        """
+        self.syncSessionCookies()
+        try:
+            response = self.session.get(REWARDS_URL, timeout=15)
+            response.raise_for_status()
+        except requests.RequestException:
+            logging.debug("[DASHBOARD] HTTP fetch failed", exc_info=True)
+            return None
+        dashboard = parseDashboardData(response.text)
+        if dashboard is None:
+            logging.debug(f"[DASHBOARD] No dashboard data in {response.url}")
+        return dashboard
+
+    def syncSessionCookies(self) -> None:
+        """
+        Copies all the browser cookies to the requests session, before a request
+        depending on the login: the cookies the browser receives only reach the
+        session with a delay, and those set by scripts never do.
+        """
+        if getattr(self.session, "webdriver", None) is not None:
+            self.session.syncAllCookies()
+
+    def invalidateDashboardData(self) -> None:
+        """
+        To call after any action that may change the points, searches or activities.
+        """
+        self.dashboardData = None
 
     def getDailySetPromotions(self) -> list[dict]:
         return self.getDashboardData()["dailySetPromotions"][
@@ -279,16 +505,13 @@ class Utils:
         return self.getDailySetPromotions() + self.getMorePromotions()
 
     def getBingInfo(self) -> Any:
-        session = makeRequestsSession()
         retries = CONFIG.retries.max
         backoff_factor = CONFIG.get("retries.backoff-factor")
 
-        for cookie in self.webdriver.get_cookies():
-            session.cookies.set(cookie["name"], cookie["value"])
-
         for attempt in range(retries):
+            self.syncSessionCookies()
             try:
-                response = session.get(
+                response = self.session.get(
                     "https://www.bing.com/rewards/panelflyout/getuserinfo"
                 )
                 assert (
@@ -300,7 +523,7 @@ class Utils:
                 if attempt < retries - 1:
                     sleep_time = backoff_factor * (2**attempt)
                     logging.info(f"Retrying in {sleep_time} seconds...")
-                    time.sleep(sleep_time)
+                    sleep(sleep_time)
                 else:
                     # noinspection PyUnboundLocalVariable
                     logging.debug(response)
@@ -359,16 +582,56 @@ class Utils:
             ).click()
 
     def switchToNewTab(self, timeToWait: float = 10, closeTab: bool = False) -> None:
-        time.sleep(timeToWait)
-        self.webdriver.switch_to.window(window_name=self.webdriver.window_handles[1])
+        """
+        Switches to the last opened tab as soon as it exists, waiting `timeToWait`
+        seconds at most.
+        """
+        handles = WebDriverWait(
+            self.webdriver, timeToWait, poll_frequency=TAB_POLL_FREQUENCY
+        ).until(
+            lambda driver: len(handles := driver.window_handles) > 1 and handles
+        )
+        self.webdriver.switch_to.window(window_name=handles[-1])
+        # Only for what the tab loads from now on, e.g. the next quiz questions
+        self.blockRequests("quiz")
+        self.waitUntilReady("activity")
         if closeTab:
             self.closeCurrentTab()
 
+    def answerQuizQuestion(
+        self,
+        quizAnswers: "QuizAnswers",
+        quizId: str,
+        question: int,
+        choices: list[str],
+        nextButton: tuple[str, str],
+        pause: Callable[[], None],
+    ) -> None:
+        """
+        Answers the question with the choice (among the XPaths) known to be correct,
+        else with a guess followed by `pause`, then goes to the next question.
+
+        The result shown on the chosen answer is recorded for the other accounts, so a
+        known answer turning out wrong is corrected.
+        """
+        choice, known = quizAnswers.choose(quizId, question, len(choices))
+        self.click(self.webdriver.find_element(By.XPATH, choices[choice]))
+        if not known:
+            pause()
+        nextElement = self.waitUntilClickable(*nextButton)
+        correct = self.webdriver.execute_script(ANSWER_RESULT_SCRIPT, choices[choice])
+        if correct is not None:
+            if known and not correct:
+                logging.warning(
+                    f"[QUIZ] Known answer {choice} to question {question} of"
+                    f" {quizId} was wrong"
+                )
+            quizAnswers.setResult(quizId, question, choice, correct)
+        self.click(nextElement)
+
     def closeCurrentTab(self) -> None:
         self.webdriver.close()
-        time.sleep(0.5)
         self.webdriver.switch_to.window(window_name=self.webdriver.window_handles[0])
-        time.sleep(0.5)
 
     def click(self, element: WebElement) -> None:
         try:
@@ -388,7 +651,7 @@ class Utils:
             element.click()
 
 
-def argumentParser() -> Namespace:
+def argumentParser(args: list[str] | None = None) -> Namespace:
     parser = ArgumentParser(
         description="A simple bot that uses Selenium to farm M$ Rewards in Python",
         epilog="At least one account should be specified,"
@@ -461,6 +724,14 @@ def argumentParser() -> Namespace:
         default=None,
         help="Set to search in either desktop, mobile or both (default: both)",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of accounts to run at the same time, in their own processes or"
+        " in a single one with parallel.mode: ASYNC (default: 1)",
+    )
     parser.add_argument(
         "-da",
         "--disable-apprise",
@@ -480,7 +751,7 @@ def argumentParser() -> Namespace:
         help="Delete the session folder and temporary files and kill"
         " all chrome processes. Can help resolve issues.",
     )
-    return parser.parse_args()
+    return parser.parse_args(args)
 
 
 def getProjectRoot() -> Path:
@@ -513,6 +784,9 @@ def commandLineArgumentsAsConfig(args: Namespace) -> Config:
     if args.searchtype:
         config.search = Config()
         config.search.type = args.searchtype
+    if args.workers:
+        config.parallel = Config()
+        config.parallel.workers = args.workers
     if args.email and args.password:
         config.accounts = [
             Config(
@@ -605,16 +879,26 @@ def resetBot():
         print(f"Deleting sessions folder '{sessionPath}'")
         shutil.rmtree(sessionPath)
 
+    cachePath = getProjectRoot() / "cache"
+    if cachePath.exists():
+        print(f"Deleting cache folder '{cachePath}'")
+        shutil.rmtree(cachePath)
+
     filesToDeletePaths = (
         getProjectRoot() / "google_trends.bak",
         getProjectRoot() / "google_trends.dat",
         getProjectRoot() / "google_trends.dir",
+        getProjectRoot() / "google_trends.sqlite3",
+        getProjectRoot() / "google_trends.sqlite3-wal",
+        getProjectRoot() / "google_trends.sqlite3-shm",
         getProjectRoot() / "logs" / "previous_points_data.json",
     )
     for path in filesToDeletePaths:
         print(f"Deleting file '{path}'")
         path.unlink(missing_ok=True)
 
+    import psutil
+
     for proc in psutil.process_iter(["pid", "name"]):
         if proc.info["name"] == "chrome.exe":
             proc.kill()
@@ -623,8 +907,10 @@ def resetBot():
     sys.exit()
 
 
-def loadConfig(configFilename="config.yaml") -> Config:
-    args = argumentParser()
+def loadConfig(
+    configFilename="config.yaml", commandLineArgs: list[str] | None = None
+) -> Config:
+    args = argumentParser(commandLineArgs)
     if args.config:
         configFile = Path(args.config)
     else:
@@ -647,7 +933,9 @@ def loadConfig(configFilename="config.yaml") -> Config:
     return config
 
 
-def initApprise() -> Apprise:
+def initApprise() -> "Apprise":
+    from apprise import Apprise  # slow to import, only needed to notify
+
     apprise = Apprise()
 
     urls = []
@@ -660,6 +948,23 @@ def initApprise() -> Apprise:
     return apprise
 
 
+class LazyApprise:
+    """
+    Sends notifications through an Apprise instance set up on first use.
+    """
+
+    def __init__(self):
+        self.apprise: "Apprise | None" = None
+
+    def notify(self, *args, **kwargs) -> bool | None:
+        if self.apprise is None:
+            self.apprise = initApprise()
+        return self.apprise.notify(*args, **kwargs)
+
+    def reset(self) -> None:
+        self.apprise = None
+
+
 def getAnswerCode(key: str, string: str) -> str:
     t = sum(ord(string[i]) for i in range(len(string)))
     t += int(key[-2:], 16)
@@ -689,7 +994,9 @@ from typing import TypeVar
 T = TypeVar("T", bound=Session)
 
 
-def makeRequestsSession(session: T = requests.session()) -> T:
+def makeRequestsSession(session: T | None = None) -> T:
+    if session is None:
+        session = requests.Session()
     retry = Retry(
         total=CONFIG.retries.max,
         backoff_factor=CONFIG.get("retries.backoff-factor"),
@@ -709,14 +1016,52 @@ def makeRequestsSession(session: T = requests.session()) -> T:
     return session
 
 
+def getCooldownTime() -> int:
+    """
+    Returns a random number of seconds to wait between two searches/activities.
+    """
+    return random.randint(CONFIG.cooldown.min, CONFIG.cooldown.max)
+
+
 def cooldown() -> None:
     if sys.gettrace():
         logging.info("[DEBUGGER] Debugger is attached, skipping cooldown.")
         return
 
-    cooldownTime = random.randint(CONFIG.cooldown.min, CONFIG.cooldown.max)
+    cooldownTime = getCooldownTime()
     logging.info(f"[COOLDOWN] Waiting for {cooldownTime} seconds")
-    time.sleep(cooldownTime)
+    sleep(cooldownTime)
+
+
+_threadState = threading.local()
+
+
+def sleep(seconds: float) -> None:
+    """
+    Waits for the given number of seconds.
+    When the current account is run by the cooperative scheduler, the wait is handed
+    over to its event loop, so other accounts can use the browser meanwhile.
+    """
+    waitHook = getattr(_threadState, "waitHook", None)
+    if waitHook is None:
+        time.sleep(seconds)
+        return
+    waitHook(seconds)
+
+
+def setWaitHook(waitHook: Callable[[float], None] | None) -> None:
+    """
+    Sets the function used by `sleep` in the current thread, `None` to block as usual.
+    """
+    _threadState.waitHook = waitHook
+
+
+def hasWaitHook() -> bool:
+    """
+    Returns whether `sleep` hands waits over to the cooperative scheduler in the
+    current thread. The hook isn't inherited by the threads it starts.
+    """
+    return getattr(_threadState, "waitHook", None) is not None
 
 
 def isValidCountryCode(countryCode: str) -> bool:
@@ -777,7 +1122,67 @@ def isValidLanguageCode(languageCode: str) -> bool:
     return True
 
 
-def getLanguageCountry() -> tuple[str, str]:
+GEOLOCATION_TTL = 24 * 60 * 60
+"""
+how many seconds an IP geolocation is cached
+"""
+
+
+def getIpLocation(proxy: str | None = None) -> dict | None:
+    """
+    Geolocates the IP the bot appears from when going through the given proxy,
+    cached on disk for `GEOLOCATION_TTL` seconds.
+
+    Returns:
+        the ipapi.co location, or None if it couldn't be determined
+    """
+    from .cache import JsonCache
+
+    geolocationCache = JsonCache("geolocation", ttl=GEOLOCATION_TTL)
+    # Hashed, as proxies usually contain credentials
+    cacheKey = hashlib.sha256((proxy or "").encode()).hexdigest()
+    if location := geolocationCache.get(cacheKey):
+        return location
+
+    try:
+        response = requests.get(
+            "https://ipapi.co/json/",
+            headers={"user-agent": "MS-Rewards-Farmer"},
+            proxies={"http": proxy, "https": proxy} if proxy else None,
+            timeout=30,
+        )
+        if response.status_code == requests.codes.too_many_requests:  # pylint: disable=no-member
+            logging.warning("Rate limited by ipapi")
+            return None
+        response.raise_for_status()
+        location = response.json()
+    except (requests.RequestException, JSONDecodeError):
+        logging.warning("Failed to geolocate IP", exc_info=True)
+        return None
+    if location.get("error"):
+        logging.warning(f"Failed to geolocate IP: {location.get('reason')}")
+        return None
+
+    geolocationCache.set(cacheKey, location)
+    return location
+
+
+def prefetchLanguageCountries(accounts: list[Config]) -> None:
+    """
+    Resolves the language and country of every proxy used by the accounts at once,
+    so browsers don't wait for the geolocation one after the other.
+    """
+    proxies = {CONFIG.browser.proxy or account.get("proxy") for account in accounts}
+    with ThreadPoolExecutor(max_workers=len(proxies) or 1) as executor:
+        list(executor.map(getLanguageCountry, proxies))
+
+
+@functools.cache
+def getLanguageCountry(proxy: str | None = None) -> tuple[str, str]:
+    """
+    Returns the language and country to use, from the configuration or else from
+    the location of the IP the bot appears from through the given proxy.
+    """
     country = CONFIG.browser.geolocation
     language = CONFIG.browser.language
 
@@ -788,15 +1193,13 @@ def getLanguageCountry() -> tuple[str, str]:
 
     ipapiLocation = None
     if not country or not isValidCountryCode(country):
-        try:
-            ipapiLocation = ipapi.location()
+        ipapiLocation = getIpLocation(proxy)
+        if ipapiLocation is not None:
             country = ipapiLocation["country"]
             regionCode = ipapiLocation["region_code"]
             if regionCode:
                 country = country + "-" + regionCode
             assert isValidCountryCode(country)
-        except RateLimited:
-            logging.warning("Rate limited by ipapi")
 
     if language and not isValidLanguageCode(language):
         logging.warning(
@@ -804,13 +1207,11 @@ def getLanguageCountry() -> tuple[str, str]:
         )
 
     if not language or not isValidLanguageCode(language):
-        try:
-            if ipapiLocation is None:
-                ipapiLocation = ipapi.location()
+        if ipapiLocation is None:
+            ipapiLocation = getIpLocation(proxy)
+        if ipapiLocation is not None:
             language = ipapiLocation["languages"].split(",")[0]
             assert isValidLanguageCode(language)
-        except RateLimited:
-            logging.warning("Rate limited by ipapi")
 
     if not language:
         language = "en-US"
@@ -833,11 +1234,50 @@ def load_localized_activities(language: str) -> ModuleType:
         logging.warning(f"No search queries found for language: {language}, defaulting to English (en)")
         return importlib.import_module("localized_activities.en")
 
-CONFIG = loadConfig()
-APPRISE = initApprise()
-LANGUAGE, COUNTRY = getLanguageCountry()
-localized_activities = load_localized_activities(
-    LANGUAGE.split("-")[0] if "-" in LANGUAGE else LANGUAGE
-)
-ACTIVITY_TITLES_TO_QUERIES = localized_activities.title_to_query
-IGNORED_ACTIVITIES = localized_activities.ignore
+
+@functools.cache
+def getLocalizedActivities(language: str) -> ModuleType:
+    """
+    Returns the localized activities for the given language code, with or without region.
+    """
+    return load_localized_activities(language.split("-")[0])
+
+
+CONFIG: Config = Config()
+"""
+the configuration, empty until `init` is called
+"""
+APPRISE = LazyApprise()
+
+
+def init(config: Config | None = None, args: list[str] | None = None) -> Config:
+    """
+    Loads the configuration into `CONFIG`, from the command line arguments and
+    configuration file unless a configuration is given (e.g. in worker processes).
+    Importing this module has no side effects, this has to be called before running
+    the bot. The notifications, language and country are set up when first used.
+
+    Args:
+        config: an already loaded configuration
+        args: the command line arguments to use instead of `sys.argv`
+    """
+    if config is None:
+        config = loadConfig(commandLineArgs=args)
+    CONFIG.clear()
+    CONFIG.update(config)
+    APPRISE.reset()
+    getLanguageCountry.cache_clear()
+    return CONFIG
+
+
+def __getattr__(name: str) -> Any:
+    # Computed on first access, as they depend on the configuration and the IP location
+    if name == "LANGUAGE":
+        return getLanguageCountry()[0]
+    if name == "COUNTRY":
+        return getLanguageCountry()[1]
+    if name == "ACTIVITY_TITLES_TO_QUERIES":
+        return getLocalizedActivities(getLanguageCountry()[0]).title_to_query
+    if name == "IGNORED_ACTIVITIES":
+        return getLocalizedActivities(getLanguageCountry()[0]).ignore
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
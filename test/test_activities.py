@@ -0,0 +1,39 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from selenium.common import NoSuchElementException
+
+from src.activities import ACTIVITY_ELEMENTS_SCRIPT, Activities
+from src.utils import DOCUMENT_ORIGIN_SCRIPT, init
+
+ACTIVITY = {"offerId": "offer", "title": "Quiz"}
+
+
+class TestActivityElements(TestCase):
+    def setUp(self):
+        init(args=[])
+        self.browser = MagicMock(localeLang="en")
+        self.activities = Activities(self.browser)
+        self.webdriver = self.browser.webdriver
+        self.cards = iter([])
+        self.webdriver.execute_script.side_effect = lambda script, *args: (
+            1.0 if script == DOCUMENT_ORIGIN_SCRIPT else next(self.cards)
+        )
+
+    def test_waits_for_cards_to_render(self):
+        card = MagicMock()
+        self.cards = iter([{"offer": None}, {"offer": card}])
+        self.assertIs(self.activities.getActivityElement(ACTIVITY), card)
+        # Indexed once for the document
+        self.assertIs(self.activities.getActivityElement(ACTIVITY), card)
+
+    def test_missing_card_raises(self):
+        self.cards = iter(lambda: {"offer": None}, None)
+        with self.assertRaises(NoSuchElementException):
+            self.activities.getActivityElement(ACTIVITY, timeToWait=0.1)
+        self.assertTrue(
+            any(
+                call.args[0] == ACTIVITY_ELEMENTS_SCRIPT
+                for call in self.webdriver.execute_script.call_args_list
+            )
+        )
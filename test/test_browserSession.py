@@ -0,0 +1,56 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from src.browserSession import BrowserSession
+from src.utils import init
+
+
+class TestBrowserSession(TestCase):
+    def setUp(self):
+        init(args=[])
+        self.webdriver = MagicMock()
+        self.webdriver.execute_cdp_cmd.return_value = {
+            "cookies": [
+                {
+                    "name": "_U",
+                    "value": "token",
+                    "domain": ".bing.com",
+                    "path": "/",
+                    "expires": -1,
+                    "session": True,
+                }
+            ]
+        }
+        self.session = BrowserSession(self.webdriver)
+        self.session.syncAllCookies()
+
+    def receive(self, url: str, setCookie: str) -> None:
+        self.session.onRequestWillBeSent(
+            {"params": {"requestId": "1", "request": {"url": url}}}
+        )
+        self.session.onResponseReceivedExtraInfo(
+            {"params": {"requestId": "1", "headers": {"Set-Cookie": setCookie}}}
+        )
+
+    def test_full_sync_copies_browser_cookies(self):
+        self.assertEqual(self.session.cookies.get("_U", domain=".bing.com"), "token")
+        self.assertFalse(self.session.needsFullSync)
+
+    def test_set_cookie_updates_jar(self):
+        self.receive(
+            "https://rewards.bing.com/",
+            "a=1; Path=/; Secure\nb=2; Domain=bing.com; Max-Age=3600",
+        )
+        self.assertEqual(self.session.cookies.get("a", domain="rewards.bing.com"), "1")
+        self.assertEqual(self.session.cookies.get("b", domain=".bing.com"), "2")
+        self.webdriver.execute_cdp_cmd.assert_called_once()
+
+    def test_expired_set_cookie_removes_cookie(self):
+        self.receive("https://www.bing.com/", "_U=; Domain=.bing.com; Max-Age=0")
+        self.assertIsNone(self.session.cookies.get("_U", domain=".bing.com"))
+
+    def test_host_only_cookie_from_unknown_request_forces_full_sync(self):
+        self.session.onResponseReceivedExtraInfo(
+            {"params": {"requestId": "2", "headers": {"set-cookie": "c=3"}}}
+        )
+        self.assertTrue(self.session.needsFullSync)
@@ -0,0 +1,49 @@
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.cache import JsonCache
+
+
+class TestJsonCache(TestCase):
+    def setUp(self):
+        self.tmpDir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpDir.cleanup)
+        patcher = patch("src.cache.getCacheDir", return_value=Path(self.tmpDir.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_set_then_get(self):
+        JsonCache("test").set("key", "value", extra=1)
+        cache = JsonCache("test")
+        self.assertEqual(cache.get("key"), "value")
+        self.assertEqual(cache.getEntry("key")["extra"], 1)
+
+    def test_expired_entry_returns_default(self):
+        cache = JsonCache("test", ttl=60)
+        cache.set("key", "value")
+        with patch("src.cache.time.time", return_value=time.time() + 61):
+            self.assertEqual(cache.get("key", "default"), "default")
+            self.assertEqual(cache.getEntry("key")["value"], "value")
+
+    def test_corrupted_file_is_ignored(self):
+        cache = JsonCache("test")
+        cache.path.write_text("{not json", encoding="utf-8")
+        self.assertIsNone(cache.get("key"))
+
+    def test_concurrent_sets_keep_every_entry(self):
+        barrier = threading.Barrier(8)
+
+        def setEntry(index: int):
+            barrier.wait()
+            JsonCache("test").set(str(index), index)
+
+        threads = [threading.Thread(target=setEntry, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(JsonCache("test").load()), 8)
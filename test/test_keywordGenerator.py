@@ -0,0 +1,33 @@
+from datetime import date
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.keywordGenerator import KeywordGenerator
+
+
+class TestKeywordGenerator(TestCase):
+    def test_generates_distinct_queries(self):
+        for language in ("en", "es", "fr", "it"):
+            queries = list(KeywordGenerator(language).generate(500))
+            self.assertEqual(len(queries), 500, language)
+            self.assertEqual(len(set(queries)), 500, language)
+            self.assertTrue(all("{" not in query for query in queries), language)
+
+    def test_same_seed_same_queries(self):
+        self.assertEqual(
+            list(KeywordGenerator("en-US", seed=42).generate(20)),
+            list(KeywordGenerator("en-US", seed=42).generate(20)),
+        )
+
+    def test_repeated_slot_uses_different_words(self):
+        generator = KeywordGenerator("en", seed=0)
+        generator.templates = [["", "city", " to ", "city", ""]]
+        generator.words = {"city": ["paris", "rome"]}
+        self.assertIn(generator.generateOne(), ("paris to rome", "rome to paris"))
+
+    def test_year_is_the_current_one(self):
+        with patch("src.keywordGenerator.date") as mockDate:
+            mockDate.today.return_value = date(2031, 5, 1)
+            generator = KeywordGenerator("en", seed=0)
+        generator.templates = [["", "year", ""]]
+        self.assertEqual(generator.generateOne(), "2031")
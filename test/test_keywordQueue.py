@@ -0,0 +1,55 @@
+import tempfile
+import time
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.keywordQueue import KeywordQueue
+
+
+class TestKeywordQueue(TestCase):
+    def setUp(self):
+        self.tmpDir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpDir.cleanup)
+        self.queue = KeywordQueue(Path(self.tmpDir.name) / "keywords.sqlite3")
+        self.addCleanup(self.queue.close)
+
+    def test_pop_in_insertion_order(self):
+        self.assertEqual(self.queue.add("US", ["a", "b", "a"]), 2)
+        self.assertEqual(self.queue.count("US"), 2)
+        self.assertEqual(self.queue.pop("US"), "a")
+        self.assertEqual(self.queue.pop("US"), "b")
+        self.assertIsNone(self.queue.pop("US"))
+
+    def test_searched_keyword_is_not_queued_again(self):
+        self.queue.add("US", ["a"])
+        self.queue.pop("US")
+        self.assertEqual(self.queue.add("US", ["a", "b"]), 1)
+        self.assertEqual(self.queue.pop("US"), "b")
+
+    def test_countries_are_separate(self):
+        self.queue.add("US", ["a"])
+        self.assertIsNone(self.queue.pop("FR"))
+        self.assertEqual(self.queue.count("US"), 1)
+
+    def test_expired_keywords_are_skipped(self):
+        self.queue.add("US", ["a"])
+        with patch(
+            "src.keywordQueue.time.time", return_value=time.time() + self.queue.ttl + 1
+        ):
+            self.assertEqual(self.queue.count("US"), 0)
+            self.assertIsNone(self.queue.pop("US"))
+
+    def test_fetch_is_claimed_once(self):
+        self.assertTrue(self.queue.claimFetch("US", refreshAfter=60, timeout=60))
+        self.assertTrue(self.queue.isFetching("US", timeout=60))
+        self.assertFalse(self.queue.claimFetch("US", refreshAfter=60, timeout=60))
+        self.queue.finishFetch("US", succeeded=True)
+        self.assertFalse(self.queue.isFetching("US", timeout=60))
+        self.assertFalse(self.queue.claimFetch("US", refreshAfter=60, timeout=60))
+        self.assertTrue(self.queue.claimFetch("US", refreshAfter=0, timeout=60))
+
+    def test_failed_fetch_can_be_claimed_again(self):
+        self.queue.claimFetch("US", refreshAfter=60, timeout=60)
+        self.queue.finishFetch("US", succeeded=False)
+        self.assertTrue(self.queue.claimFetch("US", refreshAfter=60, timeout=60))
@@ -2,10 +2,17 @@ import unittest
 from unittest.mock import patch, MagicMock
 
 import main
-from src.utils import Config, CONFIG, APPRISE
+from src.utils import Config, CONFIG, APPRISE, init
 
 
 class TestMain(unittest.TestCase):
+    def setUp(self):
+        init(args=[])
+        # No geolocation requests nor keywords database
+        for name in ("prefetchLanguageCountries", "prefetchTrends"):
+            patcher = patch.object(main, name)
+            patcher.start()
+            self.addCleanup(patcher.stop)
 
     @patch.object(main, "executeBot")
     def test_exit_1_when_exception(
@@ -0,0 +1,56 @@
+import datetime
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.quizAnswers import QuizAnswers
+
+
+class TestQuizAnswers(TestCase):
+    def setUp(self):
+        self.tmpDir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpDir.cleanup)
+        self.path = Path(self.tmpDir.name) / "quiz_answers.sqlite3"
+        self.answers = QuizAnswers("US", self.path)
+        self.addCleanup(self.answers.close)
+
+    def test_correct_choice_is_shared(self):
+        self.assertFalse(self.answers.choose("quiz", 0, 3)[1])
+        self.answers.setResult("quiz", 0, 2, True)
+        with QuizAnswers("US", self.path) as otherAccount:
+            self.assertEqual(otherAccount.choose("quiz", 0, 3), (2, True))
+            self.assertFalse(otherAccount.choose("quiz", 1, 3)[1])
+            self.assertFalse(otherAccount.choose("otherQuiz", 0, 3)[1])
+
+    def test_wrong_choices_are_not_guessed_again(self):
+        self.answers.setResult("quiz", 0, 0, False)
+        for _ in range(20):
+            choice, known = self.answers.choose("quiz", 0, 3)
+            self.assertIn(choice, (1, 2))
+            self.assertFalse(known)
+        self.answers.setResult("quiz", 0, 2, False)
+        self.assertEqual(self.answers.choose("quiz", 0, 3), (1, True))
+
+    def test_out_of_range_choice_is_ignored(self):
+        self.answers.setResult("quiz", 0, 5, True)
+        choice, known = self.answers.choose("quiz", 0, 3)
+        self.assertIn(choice, range(3))
+        self.assertFalse(known)
+
+    def test_countries_are_separate(self):
+        self.answers.setResult("quiz", 0, 2, True)
+        with QuizAnswers("FR", self.path) as otherCountry:
+            self.assertFalse(otherCountry.choose("quiz", 0, 3)[1])
+
+    def test_results_expire_the_next_day(self):
+        self.answers.setResult("quiz", 0, 2, True)
+        tomorrow = (datetime.date.today() + datetime.timedelta(days=1)).isoformat()
+        with patch.object(QuizAnswers, "today", return_value=tomorrow):
+            self.assertFalse(self.answers.choose("quiz", 0, 3)[1])
+            with QuizAnswers("US", self.path) as nextDay:
+                self.assertEqual(
+                    nextDay.connection.execute("SELECT COUNT(*) FROM choices")
+                    .fetchone()[0],
+                    0,
+                )
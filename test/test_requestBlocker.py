@@ -0,0 +1,46 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from src.requestBlocker import BLOCKED_URLS, TYPICAL_SIZES, RequestBlocker
+from src.utils import init
+
+
+class TestRequestBlocker(TestCase):
+    def setUp(self):
+        init(args=[])
+        self.webdriver = MagicMock()
+        self.blocker = RequestBlocker(self.webdriver)
+
+    def test_use_sets_profile_blocklist(self):
+        self.blocker.use("search")
+        urls = self.webdriver.execute_cdp_cmd.call_args.args[1]["urls"]
+        self.assertEqual(urls, BLOCKED_URLS["common"] + BLOCKED_URLS["search"])
+        self.assertEqual(self.blocker.profile, "search")
+
+    def test_disabled_blocks_nothing(self):
+        self.blocker.enabled = False
+        self.blocker.use("rewards")
+        self.webdriver.execute_cdp_cmd.assert_not_called()
+
+    def test_report_counts_blocked_and_loaded_requests(self):
+        self.blocker.onLoadingFailed(
+            {"params": {"blockedReason": "inspector", "type": "Font"}}
+        )
+        self.blocker.onLoadingFailed({"params": {"errorText": "net::ERR_FAILED"}})
+        self.blocker.onLoadingFinished({"params": {"encodedDataLength": 2048}})
+        self.assertEqual(self.blocker.blockedRequests.total(), 1)
+        self.assertEqual(self.blocker.bytesReceived, 2048)
+        self.assertIn("blocked 1 requests (1 font)", self.blocker.report())
+
+    def test_bytes_saved_are_estimated_per_type(self):
+        self.blocker.onResponseReceived({"params": {"requestId": "1", "type": "Image"}})
+        self.blocker.onLoadingFinished(
+            {"params": {"requestId": "1", "encodedDataLength": 1000}}
+        )
+        for resourceType in ("Image", "Image", "Font"):
+            self.blocker.onLoadingFailed(
+                {"params": {"blockedReason": "inspector", "type": resourceType}}
+            )
+        self.assertEqual(
+            self.blocker.estimateBytesSaved(), 2 * 1000 + TYPICAL_SIZES["Font"]
+        )
@@ -0,0 +1,27 @@
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from src.searches import Searches
+from src.utils import init
+
+
+class TestWaitForCredit(TestCase):
+    def setUp(self):
+        init(args=[])
+        for target in ("src.searches.KeywordQueue", "src.searches.sleep"):
+            patcher = patch(target)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.browser = MagicMock()
+        self.searches = Searches(self.browser)
+
+    def test_polls_until_points_rise(self):
+        self.browser.utils.getAccountPoints.side_effect = [100, 100, 103]
+        self.assertEqual(self.searches.waitForCredit(100), 103)
+        self.assertEqual(self.browser.utils.invalidateDashboardData.call_count, 3)
+
+    def test_gives_up_after_timeout(self):
+        self.browser.utils.getAccountPoints.return_value = 100
+        with patch("src.searches.CREDIT_TIMEOUT", 0):
+            self.assertEqual(self.searches.waitForCredit(100), 100)
+        self.browser.utils.getAccountPoints.assert_called_once()
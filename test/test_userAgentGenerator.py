@@ -0,0 +1,85 @@
+import tempfile
+import time
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from src.cache import JsonCache
+from src.userAgentGenerator import GenerateUserAgent
+
+URL = "https://example.com/versions.json"
+
+
+def makeResponse(
+    statusCode: int, data: dict | None = None, headers: dict | None = None
+) -> MagicMock:
+    response = MagicMock(status_code=statusCode, headers=headers or {})
+    response.json.return_value = data
+    return response
+
+
+class TestGetCachedVersion(TestCase):
+    def setUp(self):
+        self.tmpDir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpDir.cleanup)
+        patcher = patch("src.cache.getCacheDir", return_value=Path(self.tmpDir.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = JsonCache("user_agent_versions", ttl=60)
+        patcher = patch.object(GenerateUserAgent, "VERSIONS_CACHE", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.session = MagicMock()
+        self.generator = GenerateUserAgent(self.session)
+
+    def getVersion(self):
+        return self.generator.getCachedVersion(URL, lambda data: data["version"])
+
+    def test_fresh_entry_is_used_without_request(self):
+        self.cache.set(URL, "1.0")
+        self.assertEqual(self.getVersion(), "1.0")
+        self.session.get.assert_not_called()
+
+    def test_expired_entry_is_revalidated(self):
+        self.cache.set(URL, "1.0", etag='"v1"', lastModified=None)
+        self.session.get.return_value = makeResponse(
+            requests.codes.not_modified, headers={"ETag": '"v1"'}
+        )
+        with patch("src.cache.time.time", return_value=time.time() + 61):
+            self.assertEqual(self.getVersion(), "1.0")
+        self.assertEqual(
+            self.session.get.call_args.kwargs["headers"], {"If-None-Match": '"v1"'}
+        )
+        # Revalidated, so fresh again
+        self.session.get.reset_mock()
+        self.assertEqual(self.getVersion(), "1.0")
+        self.session.get.assert_not_called()
+
+    def test_revalidation_keeps_validators_not_sent_again(self):
+        self.cache.set(URL, "1.0", etag='"v1"', lastModified="Mon, 01 Jan 2024")
+        self.session.get.return_value = makeResponse(requests.codes.not_modified)
+        with patch("src.cache.time.time", return_value=time.time() + 61):
+            self.assertEqual(self.getVersion(), "1.0")
+        entry = self.cache.getEntry(URL)
+        self.assertEqual(entry["etag"], '"v1"')
+        self.assertEqual(entry["lastModified"], "Mon, 01 Jan 2024")
+
+    def test_changed_version_replaces_cached_one(self):
+        self.session.get.return_value = makeResponse(
+            requests.codes.ok, {"version": "2.0"}, {"ETag": '"v2"'}
+        )
+        self.assertEqual(self.getVersion(), "2.0")
+        self.assertEqual(self.cache.getEntry(URL)["etag"], '"v2"')
+
+    def test_last_known_version_is_used_when_offline(self):
+        self.cache.set(URL, "1.0")
+        self.session.get.side_effect = requests.ConnectionError()
+        with patch("src.cache.time.time", return_value=time.time() + 61):
+            self.assertEqual(self.getVersion(), "1.0")
+
+    def test_request_error_is_raised_without_cached_version(self):
+        self.session.get.side_effect = requests.ConnectionError()
+        with self.assertRaises(requests.ConnectionError):
+            self.getVersion()
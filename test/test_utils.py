@@ -1,12 +1,39 @@
+import subprocess
+import sys
 from unittest import TestCase
+from unittest.mock import MagicMock, PropertyMock, patch
 
 # noinspection PyPackageRequirements
 from parameterized import parameterized
 
-from src.utils import CONFIG, APPRISE, isValidCountryCode, isValidLanguageCode
+from src.utils import (
+    CONFIG,
+    APPRISE,
+    getProjectRoot,
+    init,
+    isValidCountryCode,
+    isValidLanguageCode,
+)
 
 
 class TestUtils(TestCase):
+    def setUp(self):
+        init(args=[])
+
+    def test_import_has_no_side_effects(self):
+        subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, src.utils;"
+                " assert not src.utils.CONFIG;"
+                " assert 'ipapi' not in sys.modules and 'apprise' not in sys.modules",
+                "--not-an-argument",
+            ],
+            cwd=getProjectRoot(),
+            check=True,
+        )
+
     def test_send_notification(self):
         CONFIG.apprise.enabled = True
         APPRISE.notify("body", "title")
@@ -51,3 +78,164 @@ class TestUtils(TestCase):
 
         with self.assertRaises(FileNotFoundError):
             load_localized_activities("foo")
+
+
+class TestDashboardSnapshot(TestCase):
+    def setUp(self):
+        from src.constants import REWARDS_URL
+        from src.utils import Utils
+
+        self.webdriver = MagicMock(current_url=REWARDS_URL)
+        self.webdriver.execute_script.return_value = {
+            "userStatus": {"availablePoints": 42}
+        }
+        self.utils = Utils(self.webdriver)
+        for patcher in (
+            patch("src.utils.PREFER_HTTP_DASHBOARD", False),
+            # Navigation readiness is covered by TestPageReadiness
+            patch.object(self.utils, "goTo"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_reads_share_one_snapshot(self):
+        self.assertEqual(self.utils.getAccountPoints(), 42)
+        self.assertEqual(self.utils.getAccountPoints(), 42)
+        self.webdriver.execute_script.assert_called_once()
+
+    def test_invalidate_reloads_dashboard(self):
+        self.utils.getDashboardData()
+        self.utils.invalidateDashboardData()
+        self.utils.getDashboardData()
+        self.assertEqual(self.webdriver.execute_script.call_count, 2)
+
+    def test_http_fetch_syncs_cookies_first(self):
+        session = MagicMock()
+        session.get.side_effect = lambda *args, **kwargs: (
+            session.syncAllCookies.assert_called_once() or MagicMock(text="")
+        )
+        self.utils.session = session
+        self.assertIsNone(self.utils.fetchDashboardData())
+        session.get.assert_called_once()
+
+    def test_parse_dashboard_data(self):
+        from src.utils import parseDashboardData
+
+        html = (
+            '<script>var dashboard = {"userStatus": {"availablePoints": 42},'
+            ' "title": "a }; b"};\nvar other = 1;</script>'
+        )
+        self.assertEqual(
+            parseDashboardData(html)["userStatus"]["availablePoints"], 42
+        )
+        self.assertIsNone(parseDashboardData("<html>Sign in</html>"))
+
+    def test_raises_when_dashboard_never_ready(self):
+        from src.utils import DashboardDataError
+
+        self.webdriver.execute_script.return_value = None
+        with patch("src.utils.DASHBOARD_TIMEOUT", 0.1):
+            with self.assertRaises(DashboardDataError):
+                self.utils.getDashboardData()
+
+
+class TestPageReadiness(TestCase):
+    def setUp(self):
+        from src.utils import Utils
+
+        self.webdriver = MagicMock()
+        self.utils = Utils(self.webdriver)
+
+    def test_waits_for_new_document(self):
+        from src.utils import DOCUMENT_ORIGIN_SCRIPT
+
+        origins = iter([1.0, 1.0, 2.0])
+        self.webdriver.execute_script.side_effect = lambda script: (
+            next(origins) if script == DOCUMENT_ORIGIN_SCRIPT else True
+        )
+        self.utils.goTo("https://rewards.bing.com/", "rewards")
+        self.webdriver.get.assert_called_once_with("https://rewards.bing.com/")
+        self.assertRaises(StopIteration, next, origins)
+
+    def test_raises_when_page_never_ready(self):
+        from selenium.common import TimeoutException
+
+        self.webdriver.execute_script.return_value = False
+        with patch("src.utils.PAGE_READY_TIMEOUT", 0.1):
+            with self.assertRaises(TimeoutException):
+                self.utils.waitUntilReady("activity")
+
+
+class TestTabs(TestCase):
+    def setUp(self):
+        from src.constants import REWARDS_URL
+        from src.utils import Utils
+
+        self.webdriver = MagicMock(current_url=REWARDS_URL)
+        self.utils = Utils(self.webdriver)
+
+    def test_switches_once_tab_exists(self):
+        type(self.webdriver).window_handles = PropertyMock(
+            side_effect=[["rewards"], ["rewards", "activity"]]
+        )
+        self.utils.switchToNewTab()
+        self.webdriver.switch_to.window.assert_called_once_with(window_name="activity")
+
+    def test_new_tab_is_closed_once_loading(self):
+        type(self.webdriver).window_handles = PropertyMock(
+            return_value=["rewards", "activity"]
+        )
+        currentUrl = PropertyMock(
+            side_effect=["about:blank", "about:blank", "https://www.bing.com/"]
+        )
+        type(self.webdriver).current_url = currentUrl
+        self.webdriver.execute_script.return_value = True
+        self.utils.switchToNewTab(closeTab=True)
+        self.assertEqual(currentUrl.call_count, 3)
+        self.webdriver.close.assert_called_once()
+
+    def test_reset_keeps_rewards_page(self):
+        type(self.webdriver).window_handles = PropertyMock(
+            return_value=["rewards", "activity"]
+        )
+        with patch.object(self.utils, "goToRewards") as goToRewards:
+            self.utils.resetTabs()
+            goToRewards.assert_not_called()
+        self.webdriver.close.assert_called_once()
+        self.webdriver.switch_to.window.assert_called_with("rewards")
+
+
+class TestQuizAnswer(TestCase):
+    def setUp(self):
+        from src.utils import Utils
+
+        self.webdriver = MagicMock()
+        self.utils = Utils(self.webdriver)
+        self.quizAnswers = MagicMock()
+        self.pause = MagicMock()
+        for name in ("click", "waitUntilClickable"):
+            patcher = patch.object(self.utils, name)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def answer(self, known: bool, correct: bool | None) -> None:
+        self.quizAnswers.choose.return_value = (1, known)
+        self.webdriver.execute_script.return_value = correct
+        self.utils.answerQuizQuestion(
+            self.quizAnswers, "quiz", 0, ["a", "b", "c"], ("id", "next"), self.pause
+        )
+
+    def test_guess_result_is_recorded(self):
+        self.answer(known=False, correct=False)
+        self.pause.assert_called_once()
+        self.quizAnswers.setResult.assert_called_once_with("quiz", 0, 1, False)
+        self.webdriver.find_element.assert_called_once_with("xpath", "b")
+
+    def test_known_answer_skips_pause_and_is_corrected(self):
+        self.answer(known=True, correct=False)
+        self.pause.assert_not_called()
+        self.quizAnswers.setResult.assert_called_once_with("quiz", 0, 1, False)
+
+    def test_ambiguous_result_is_not_recorded(self):
+        self.answer(known=False, correct=None)
+        self.quizAnswers.setResult.assert_not_called()